@@ -1,59 +1,147 @@
+import mmap
 import random
 import os
-from functools import partial
+import time
+from array import array
 
 
 DATA = os.path.join(os.path.dirname(__file__), 'data')
 
+# HoardVocabulary instances, keyed by data path
+_vocabularies = {}
 
-class HoardItem:
+
+class WordList:
     """
-    A random item in Whisper's Bag of Hoarding.
+    A memory-mapped file of words, one per line. The file is mapped and its line offsets indexed on first use; lines
+    are decoded only when they are retrieved.
     """
-    def __init__(self):
-        self._nouns = os.path.join(DATA, 'nouns')
-        self._adjectives = os.path.join(DATA, 'adjectives')
-        self._population_cache = {}
+    def __init__(self, path):
+        self.path = path
+        self._mmap = None
+        self._offsets = None
+        self.load_time = None
+
+    def _load(self):
+        started = time.perf_counter()
+        with open(self.path, 'rb') as filehandle:
+            self._mmap = mmap.mmap(filehandle.fileno(), 0, access=mmap.ACCESS_READ)
+        offsets = array('I')
+        position = 0
+        size = len(self._mmap)
+        while position < size:
+            offsets.append(position)
+            position = self._mmap.find(b'\n', position)
+            if position == -1:
+                break
+            position += 1
+        offsets.append(size)
+        self._offsets = offsets
+        self.load_time = time.perf_counter() - started
 
     @property
-    def noun(self):
+    def offsets(self):
         """
-        A random noun.
+        The byte offset of each line, followed by the size of the file.
         """
-        with open(self._nouns) as filehandle:
-            line = self._random_line(filehandle).strip()
-        return line.replace('_', ' ')
+        if self._offsets is None:
+            self._load()
+        return self._offsets
 
     @property
-    def adjectives(self):
+    def bytes_resident(self):
         """
-        A string containing a comma-separated list of 1 or 2 random adjectives.
+        The number of bytes held for this word list: the size of the line offset index plus the size of the mapping.
+        """
+        if self._offsets is None:
+            return 0
+        return len(self._offsets) * self._offsets.itemsize + len(self._mmap)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        offsets = self.offsets
+        return self._mmap[offsets[index]:offsets[index + 1]].decode('utf-8').strip()
+
+    def choice(self):
+        """
+        Return a random line.
+        """
+        return self[random.randrange(len(self))]
+
+
+class HoardVocabulary:
+    """
+    The nouns and adjectives from which items in the Bag of Hoarding are made. Use get_vocabulary() to get the
+    process-wide instance for a data path.
+    """
+    def __init__(self, data_path=None):
+        data_path = data_path or DATA
+        self.nouns = WordList(os.path.join(data_path, 'nouns'))
+        self.adjectives = WordList(os.path.join(data_path, 'adjectives'))
+
+    @property
+    def metrics(self):
         """
-        with open(self._adjectives) as filehandle:
-            adj = []
-            for i in range(random.choice([1, 2])):
-                adj.append(self._random_line(filehandle).strip().replace('_', ' '))
-        return ', '.join(adj)
+        A dictionary of the time spent loading each word list, in seconds, and the bytes held for each.
+        """
+        return dict(
+            (name, dict(load_time=words.load_time, bytes_resident=words.bytes_resident))
+            for (name, words) in [('nouns', self.nouns), ('adjectives', self.adjectives)]
+        )
+
+
+def get_vocabulary(data_path=None):
+    """
+    Return the shared HoardVocabulary for a data path, creating it on first use.
+    """
+    data_path = data_path or DATA
+    if data_path not in _vocabularies:
+        _vocabularies[data_path] = HoardVocabulary(data_path)
+    return _vocabularies[data_path]
+
+
+class HoardItem:
+    """
+    A random item in Whisper's Bag of Hoarding.
+    """
+    def __init__(self, data_path=None):
+        self._vocabulary = get_vocabulary(data_path)
+        self._noun = None
+        self._adjective = None
 
-    def _random_line(self, filehandle):
+    @classmethod
+    def sample(cls, count, data_path=None):
+        """
+        Return a list of count random items.
+        """
+        items = [cls(data_path) for _ in range(count)]
+        for item in items:
+            item.noun
+            item.adjectives
+        return items
+
+    @property
+    def noun(self):
         """
-        Choose a random line from a filehandle without loading the entire file into memory.
+        A random noun.
         """
-        target = random.choice(range(self._line_count(filehandle)))
-        filehandle.seek(0, 0)
-        for line_number, line in enumerate(filehandle):
-            if line_number == target:
-                return line
+        if self._noun is None:
+            self._noun = self._vocabulary.nouns.choice().replace('_', ' ')
+        return self._noun
 
-    def _line_count(self, filehandle):
+    @property
+    def adjectives(self):
         """
-        Count the number of lines in a file without having to hold the entire contents in memory.
+        A string containing a comma-separated list of 1 or 2 random adjectives.
         """
-        if filehandle.name not in self._population_cache:
-            filehandle.seek(0, 0)
-            self._population_cache[filehandle.name] = \
-                sum(chunk.count('\n') for chunk in iter(partial(filehandle.read, 1 << 15), ''))
-        return self._population_cache[filehandle.name]
+        if self._adjective is None:
+            self._adjective = ', '.join([
+                self._vocabulary.adjectives.choice().replace('_', ' ')
+                for i in range(random.choice([1, 2]))
+            ])
+        return self._adjective
 
     def __str__(self):
         item = f"{self.adjectives} {self.noun}"
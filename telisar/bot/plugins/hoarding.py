@@ -30,8 +30,8 @@ class BagOfHoarding(Plugin):
         """
         Return a list of one or more random items from the Bag.
         """
-        for i in range(count):
-            yield str(HoardItem())
+        for item in HoardItem.sample(count, self._data_path):
+            yield str(item)
 
     def run(self, message):
         """
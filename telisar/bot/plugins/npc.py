@@ -1,5 +1,5 @@
 from telisar.bot.plugins.base import Plugin, message_parts
-from telisar.npc.base import generate_npc, npc_type
+from telisar.npc.base import generate_npc, generate_names
 
 
 class NPC(Plugin):
@@ -28,9 +28,7 @@ class NPC(Plugin):
             return self.cmd_npc(*parts)
 
     def cmd_names(self, ancestry=None, count=1):
-        for _ in range(int(count)):
-            npc = npc_type(ancestry)()
-            yield npc.full_name
+        yield from generate_names(ancestry=ancestry, count=int(count))
 
     def cmd_npc(self, ancestry=None, randomize=False):
         yield generate_npc(
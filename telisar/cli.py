@@ -1,12 +1,13 @@
 from telisar.bot import hammer
 from telisar.reckoning import calendar, campaign
 from telisar import crypto, bag_of_hoarding
-from telisar.npc.base import generate_npc, npc_type
-
-from importlib import import_module
+from telisar.npc.base import generate_npc, generate_names
+from telisar.npc import namebank
+from telisar.languages import text, get_language, list_languages
+from telisar.languages.base import LanguageException
 
 import os
-import random
+import sys
 import dotenv
 import logging
 import fire
@@ -29,6 +30,10 @@ class CLI:
         """
         The Noobhammer Chronicles campaign timeline.
         """
+        database = os.getenv('TIMELINE_DATABASE')
+        if database:
+            database = os.path.expanduser(os.path.expandvars(database))
+            return campaign.SQLiteTimeline(database, campaign=os.getenv('TIMELINE_CAMPAIGN', 'default'))
         datafile = os.path.expanduser(os.path.expandvars(os.getenv('TIMELINE_DATAFILE')))
         return campaign.Timeline(datafile)
 
@@ -36,7 +41,7 @@ class CLI:
         """
         Retrieve 1 or more random items from Whisper's Bag of Hoarding.
         """
-        for item in [bag_of_hoarding.HoardItem() for i in range(int(count))]:
+        for item in bag_of_hoarding.HoardItem.sample(int(count)):
             print(str(item))
 
     def npc(self, ancestry=None, name=None, pronouns=None, title=None, nickname=None, whereabouts="Unknown",
@@ -60,39 +65,55 @@ class CLI:
             randomize=randomize
         ).character_sheet
 
-    def names(self, ancestry=None, count=1):
-        for _ in range(count):
-            print(npc_type(ancestry)().full_name)
+    def names(self, ancestry=None, count=1, workers=1, seed=None, outfile=None, unique=False):
+        """
+        Generate one or more random NPC names, optionally across several worker processes and into a file. If unique
+        is True, names are drawn from the name bank and will never be repeated.
+        """
+        if unique:
+            names = namebank.unique_names(ancestry=ancestry, count=int(count))
+        else:
+            names = generate_names(ancestry=ancestry, count=int(count), workers=int(workers), seed=seed)
+        if not outfile:
+            for name in names:
+                print(name)
+            return
+        with open(outfile, 'w') as f:
+            for name in names:
+                f.write(f'{name}\n')
 
-    def text(self, language='common', words=50):
+    def text(self, language='common', words=50, outfile=None, paragraph_length=None):
+        """
+        Generate flavor text in one of the Telisaran languages, streaming it to stdout or a file.
+        """
         try:
-            module = import_module(f'telisar.languages.{language}')
-            lang = getattr(module, language.capitalize())()
-        except AttributeError:
+            lang = get_language(language)
+        except LanguageException:
             print(f'Unsupported Language: {language}.')
             return
 
-        phrases = []
-        phrase = []
-        for word in [lang.word() for _ in range(words)]:
-            phrase.append(str(word))
-            if len(phrase) >= random.randint(1, 12):
-                phrases.append(' '.join(phrase))
-                phrase = []
-        if phrase:
-            phrases.append(' '.join(phrase))
-
-        paragraph = phrases[0].capitalize()
-        for phrase in phrases[1:]:
-            if random.choice([0, 0, 1]):
-                paragraph = paragraph + random.choice('?!.') + ' ' + phrase.capitalize()
-            else:
-                paragraph = paragraph + ', ' + phrase
-        print(f"{paragraph}.")
+        if not outfile:
+            text.write(lang, int(words), sys.stdout, paragraph_length=paragraph_length)
+            return
+        with open(outfile, 'w') as f:
+            text.write(lang, int(words), f, paragraph_length=paragraph_length)
+
+    def languages(self):
+        """
+        List the supported languages.
+        """
+        return list_languages()
 
     def cipher(self):
         return crypto.ElethisCipher()
 
+    def crack(self, infile, wordlist, workers=1):
+        """
+        Try every key in a word list against a message encrypted with Elethi's Cipher, and report the best keys.
+        """
+        with open(infile) as f:
+            return crypto.crack(f.read(), wordlist, workers=int(workers))
+
     def bot(self):
         """
         Hammer the discord bot.
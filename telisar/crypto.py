@@ -1,5 +1,18 @@
-from collections import defaultdict
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import islice
+from operator import add, getitem
+import heapq
+import math
+import multiprocessing
+import random
 import re
+import time
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
 
 
 class ElethisCipher:
@@ -66,6 +79,8 @@ class ElethisCipher:
         K  E  E  N
         10 76 04 13
 
+    An ElethisCipher created with randomize=True chooses a coordinate for each plaintext character at random.
+
 
     Decrypting Messages
     -------------------
@@ -108,7 +123,20 @@ class ElethisCipher:
     alphabet = 'abcdefghijklmnopqrstuvwxyz0123456789'
     non_alphanum = re.compile('[^A-Za-z0-9]')
 
-    def __init__(self):
+    # Each letter's coordinates are cycled to fill 256 slots, so a random byte chooses one. Every letter has 2 or 3
+    # coordinates, which makes the choice uniform to within half a percent.
+    coordinate_slots = 256
+
+    def __init__(self, randomize=False, seed=None, rng=None):
+        """
+        Args:
+            randomize (bool): If True, encrypt each plaintext letter using a randomly-chosen coordinate in the tabula
+                recta, rather than always using the first
+            seed (int): optional, a seed for the random number generator
+            rng (random.Random): optional, the random number generator to use; overrides seed
+        """
+        self.randomize = randomize
+        self.random = rng or random.Random(seed)
         self._table = []
         self._reversed = defaultdict(list)
         self._reversed_index = defaultdict(list)
@@ -116,7 +144,10 @@ class ElethisCipher:
 
     def _generate_tabula_recta(self):
         """
-        Generate the tabula recta as a two-dimensional array, and a reverse lookup table as a dictionary.
+        Generate the tabula recta as a two-dimensional array, and a reverse lookup table as a dictionary. Also
+        precompute the flat lookup tables used to encrypt and decrypt: a 100-entry list mapping each number to its
+        letter (and its uppercase letter), a 36-entry dictionary mapping each letter to its first number, and another
+        mapping each letter to all of its numbers, cycled to coordinate_slots entries.
         """
         index = 0
         for offset_y in range(0, 10):
@@ -130,6 +161,14 @@ class ElethisCipher:
                     index = 0
             self._table.append(row)
 
+        self._forward = list(''.join(self._table))
+        self._forward_upper = [letter.upper() for letter in self._forward]
+        self._reverse = dict((letter, int(numbers[0])) for (letter, numbers) in self._reversed.items())
+        self._coordinates = dict(
+            (letter, tuple(int(numbers[i % len(numbers)]) for i in range(self.coordinate_slots)))
+            for (letter, numbers) in self._reversed.items()
+        )
+
     @property
     def tabula_recta(self):
         """
@@ -146,19 +185,15 @@ class ElethisCipher:
         Perform a forward lookup of a two digit number in the tabula recta and return the corresponding letter.
         """
         n = int(n)
-        if n < 10:
-            x = 0
-            y = n
-        else:
-            y = n % 10
-            x = int((n - y)/10)
-        return self._table[x][y]
+        if n < 0 or n > 99:
+            raise ValueError(f"{n} is not in the tabula recta.")
+        return self._forward[n]
 
     def reverse(self, letter):
         """
         Perform a reverse lookup of a letter in the tabula recta and return a two-digit number corresponding to it.
         """
-        return int(self._reversed[letter][0])
+        return self._reverse[letter]
 
     def normalize(self, text):
         """
@@ -166,68 +201,404 @@ class ElethisCipher:
         """
         return self.non_alphanum.sub('', text).lower()
 
+    def _plaintext(self, text):
+        """
+        Normalize text and convert it to a list of numbers for encryption. If randomize is set, each letter's number
+        is chosen at random from all of its coordinates; otherwise it is the first.
+        """
+        text = self.normalize(text)
+        if not self.randomize:
+            return [self._reverse[x] for x in text]
+        return list(map(getitem, map(self._coordinates.__getitem__, text), self.random.randbytes(len(text))))
+
+    def _encrypt_values(self, plaintext, key):
+        """
+        Encrypt a list of plaintext numbers. The key holds the numbers preceding the plaintext in the key stream: the
+        psk at the start of a message, or the last len(psk) plaintext numbers thereafter. Returns the encrypted
+        numbers and the key for the plaintext that follows.
+        """
+        stream = key + plaintext
+        # map() stops at the end of the plaintext
+        return (list(map(add, plaintext, stream)), stream[len(stream) - len(key):])
+
+    def _decrypt_values(self, numbers, key):
+        """
+        Decrypt a list of numbers. The key holds the numbers preceding the plaintext in the key stream, as for
+        _encrypt_values(). Returns the plaintext numbers and the key for the numbers that follow.
+        """
+        # the key for each number is the plaintext number len(key) places behind it
+        stream = list(key)
+        offset = len(key)
+        for n in numbers:
+            stream.append(n - stream[-offset])
+        plaintext = stream[offset:]
+        if plaintext and (min(plaintext) < 0 or max(plaintext) > 99):
+            raise ValueError("The message cannot be decrypted with this key.")
+        return (plaintext, stream[len(stream) - offset:])
+
+    def format_blocks(self, values, block_length=5, blocks_per_line=3):
+        """
+        Lay out a sequence of encrypted numbers or plaintext characters, such as the lists returned by encrypt() and
+        decrypt() or the arrays returned by encrypt_array() and decrypt_array(), in blocks. Numbers are formatted with
+        3 digits.
+        """
+        if hasattr(values, 'tolist'):
+            values = values.tolist()
+        items = [value if isinstance(value, str) else f'{value:03d}' for value in values]
+        return self._blocks(items, 0, block_length, blocks_per_line)
+
+    def _blocks(self, items, count, block_length, blocks_per_line):
+        """
+        Lay out strings in blocks, as pretty_encrypt() and pretty_decrypt() do, given the number of items already
+        written before them.
+        """
+        line_length = block_length * blocks_per_line
+        out = []
+        for (i, item) in enumerate(items, start=count):
+            if i:
+                out.append('\n' if i % line_length == 0 else '    ' if i % block_length == 0 else ' ')
+            out.append(item)
+        return ''.join(out)
+
     def encrypt(self, psk, message):
         """
         Encrypt a message using the specified pre-shared key (psk). Returns a list of numbers.
         """
-        psk = self.normalize(psk)
-        plaintext = self.normalize(message)
-
-        key = [self.reverse(x) for x in psk + plaintext]
-        encrypted = []
-        for i in range(len(plaintext)):
-            a = self.reverse(plaintext[i])
-            x = int(a) + key[i]
-            encrypted.append(x)
-        return encrypted
+        psk = [self._reverse[x] for x in self.normalize(psk)]
+        return self._encrypt_values(self._plaintext(message), psk)[0]
 
     def pretty_encrypt(self, psk, message, block_length=5, blocks_per_line=3):
         """
         Encrypt a message using the specified pre-shared key (psk). Returns a formatted string consisting of the
         encrypted message split into blocks of 3-digit numbers, 5 numbers to a block, 3 blocks to a line.
         """
-        psk = self.normalize(psk)
-        encrypted = [f'{x:03d}' for x in self.encrypt(psk, message)]
-        blocks = [encrypted[i:i + block_length] for i in range(0, len(encrypted), block_length)]
-        return '\n'.join([
-            '    '.join([' '.join(inner) for inner in blocks[outer:outer + blocks_per_line]])
-            for outer in range(0, len(blocks), blocks_per_line)
-        ])
+        return self.format_blocks(self.encrypt(psk, message), block_length, blocks_per_line)
 
     def decrypt(self, psk, message):
         """
         Decrypte a message using the specified pre-shared key (psk). Returns a list of characters.
         """
-        psk = self.normalize(psk)
-        plaintext = []
-
-        numbers = [int(x) for x in message.split()]
-        key = [self.reverse(x) for x in psk]
-
-        for (i, n) in enumerate(numbers):
-            k = key[0]
-            a = n - k
-            plaintext.append(self.forward(a).upper())
-            key = key[1:] + [a]
-
-        return plaintext
+        psk = [self._reverse[x] for x in self.normalize(psk)]
+        forward = self._forward_upper
+        return [forward[a] for a in self._decrypt_values(map(int, message.split()), psk)[0]]
 
     def pretty_decrypt(self, psk, message, block_length=5, blocks_per_line=3):
         """
         Decryptes a message using the specified pre-shared key (psk). Returns a formatted string consisting of the
         plaintext message split into blocks of single characters, 5 characters to a block, 3 blocks to a line.
         """
-        plaintext = self.decrypt(psk, message)
-        blocks = [plaintext[i:i + block_length] for i in range(0, len(plaintext), block_length)]
-        return '\n'.join([
-            '    '.join([' '.join(inner) for inner in blocks[outer:outer + blocks_per_line]])
-            for outer in range(0, len(blocks), blocks_per_line)
-        ])
+        return self.format_blocks(self.decrypt(psk, message), block_length, blocks_per_line)
+
+    def _codes(self, text, randomize=False):
+        """
+        Normalize text and convert it to an array of tabula recta numbers with a 256-entry lookup table. If randomize
+        is True, each letter's number is chosen at random from all of its coordinates, as _plaintext() does.
+        """
+        if numpy is None:
+            raise ImportError("Array encryption requires numpy.")
+        if not hasattr(self, '_lookup'):
+            self._lookup = numpy.zeros(256, dtype=numpy.uint8)
+            self._coordinate_lookup = numpy.zeros((256, self.coordinate_slots), dtype=numpy.uint8)
+            for (letter, numbers) in self._coordinates.items():
+                self._lookup[ord(letter)] = self._reverse[letter]
+                self._coordinate_lookup[ord(letter)] = numbers
+            self._forward_array = numpy.array(self._forward_upper)
+        text = numpy.frombuffer(self.normalize(text).encode('ascii'), dtype=numpy.uint8)
+        if not randomize:
+            return self._lookup[text]
+        slots = numpy.frombuffer(self.random.randbytes(len(text)), dtype=numpy.uint8)
+        return self._coordinate_lookup[text, slots]
+
+    def encrypt_array(self, psk, message):
+        """
+        Encrypt a message using the specified pre-shared key (psk) in one vectorized operation. Requires numpy.
+        Returns a uint8 array of numbers.
+        """
+        psk = self._codes(psk)
+        plaintext = self._codes(message, self.randomize)
+        return plaintext + numpy.concatenate([psk, plaintext])[:len(plaintext)]
+
+    def decrypt_array(self, psk, message):
+        """
+        Decrypt a message, given as a string or an array of numbers, using the specified pre-shared key (psk).
+        Requires numpy. Returns an array of characters.
+
+        Each plaintext number is the encrypted number less the plaintext number len(psk) places before it, so the
+        message splits into len(psk) independent lanes. Within a lane, x[k] = y[k] - x[k - 1], and so
+        (-1)^k * x[k] = (-1)^k * y[k] + (-1)^(k - 1) * x[k - 1]: an alternating cumulative sum, computed for all the
+        lanes at once.
+        """
+        key = self._codes(psk).astype(numpy.int64)
+        if isinstance(message, str):
+            message = message.split()
+        numbers = numpy.asarray(message, dtype=numpy.int64)
+        length = len(numbers)
+        lanes = len(key)
+        rows = -(-length // lanes)
+
+        grid = numpy.zeros(rows * lanes, dtype=numpy.int64)
+        grid[:length] = numbers
+        grid = grid.reshape(rows, lanes)
+        signs = numpy.where(numpy.arange(rows) % 2, -1, 1)[:, None]
+        plaintext = (signs * (numpy.cumsum(signs * grid, axis=0) - key)).reshape(-1)[:length]
+
+        if length and (plaintext.min() < 0 or plaintext.max() > 99):
+            raise ValueError("The message cannot be decrypted with this key.")
+        return self._forward_array[plaintext]
+
+    def encrypt_stream(self, psk, in_fh, out_fh, chunk_size=64 * 1024, block_length=5, blocks_per_line=3):
+        """
+        Encrypt text read from one file handle and write it to another in the layout of pretty_encrypt(), one chunk
+        at a time, so that memory use does not depend on the length of the message. The output ends with a newline.
+
+        Returns the number of characters encrypted.
+        """
+        key = [self._reverse[x] for x in self.normalize(psk)]
+        count = 0
+        for chunk in iter(lambda: in_fh.read(chunk_size), ''):
+            (encrypted, key) = self._encrypt_values(self._plaintext(chunk), key)
+            out_fh.write(self._blocks([f'{x:03d}' for x in encrypted], count, block_length, blocks_per_line))
+            count += len(encrypted)
+        if count:
+            out_fh.write('\n')
+        return count
+
+    def decrypt_stream(self, psk, in_fh, out_fh, chunk_size=64 * 1024, block_length=5, blocks_per_line=3):
+        """
+        Decrypt numbers read from one file handle and write the plaintext to another in the layout of
+        pretty_decrypt(), one chunk at a time. A number split across two chunks is carried over to the next. The
+        output ends with a newline.
 
-    def encrypt_file(self, psk, infile):
+        Returns the number of characters decrypted.
+        """
+        key = [self._reverse[x] for x in self.normalize(psk)]
+        forward = self._forward_upper
+        count = 0
+        partial = ''
+        while True:
+            chunk = in_fh.read(chunk_size)
+            numbers = (partial + chunk).split()
+            partial = numbers.pop() if chunk and numbers and not chunk[-1].isspace() else ''
+            (plaintext, key) = self._decrypt_values(map(int, numbers), key)
+            out_fh.write(self._blocks([forward[a] for a in plaintext], count, block_length, blocks_per_line))
+            count += len(plaintext)
+            if not chunk:
+                break
+        if count:
+            out_fh.write('\n')
+        return count
+
+    def encrypt_file(self, psk, infile, outfile=None):
+        """
+        Encrypt a file. If outfile is specified, the ciphertext is streamed to it; otherwise it is returned.
+        """
         with open(infile) as f:
-            return self.pretty_encrypt(psk, f.read())
+            if not outfile:
+                return self.pretty_encrypt(psk, f.read())
+            with open(outfile, 'w') as out:
+                self.encrypt_stream(psk, f, out)
 
-    def decrypt_file(self, psk, infile):
+    def decrypt_file(self, psk, infile, outfile=None):
+        """
+        Decrypt a file. If outfile is specified, the plaintext is streamed to it; otherwise it is returned.
+        """
         with open(infile) as f:
-            return self.pretty_decrypt(psk, f.read())
+            if not outfile:
+                return self.pretty_decrypt(psk, f.read())
+            with open(outfile, 'w') as out:
+                self.decrypt_stream(psk, f, out)
+
+    def benchmark(self, length=4 * 1024 * 1024, psk='sabetha'):
+        """
+        Encrypt and decrypt a random message of the specified length and return the throughput of each in
+        characters per second, including the array methods if numpy is installed.
+        """
+        message = ''.join(random.choices(self.alphabet, k=length))
+        started = time.perf_counter()
+        encrypted = ' '.join(map(str, self.encrypt(psk, message)))
+        encrypt_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        self.decrypt(psk, encrypted)
+        decrypt_time = time.perf_counter() - started
+        result = {
+            'length': length,
+            'encrypt_chars_per_second': int(length / encrypt_time),
+            'decrypt_chars_per_second': int(length / decrypt_time),
+        }
+        if numpy is not None:
+            started = time.perf_counter()
+            encrypted = self.encrypt_array(psk, message)
+            result['encrypt_array_chars_per_second'] = int(length / (time.perf_counter() - started))
+            started = time.perf_counter()
+            self.decrypt_array(psk, encrypted)
+            result['decrypt_array_chars_per_second'] = int(length / (time.perf_counter() - started))
+        return result
+
+
+class NgramModel:
+    """
+    A letter n-gram model of a language, trained on a collection of words, for scoring how much a string of letters
+    and digits reads like that language.
+    """
+
+    def __init__(self, words, n=3):
+        """
+        Args:
+            words (iterable): The words to count n-grams in; each is normalized as for ElethisCipher
+            n (int): The length of each n-gram
+        """
+        self.n = n
+        counts = Counter()
+        for word in words:
+            word = ElethisCipher.non_alphanum.sub('', word).lower()
+            counts.update(word[i:i + n] for i in range(len(word) - n + 1))
+        total = sum(counts.values()) or 1
+        self.log_probabilities = dict((ngram, math.log10(count / total)) for (ngram, count) in counts.items())
+        # unseen n-grams are treated as a hundred times less likely than one seen once
+        self.floor = math.log10(0.01 / total)
+
+    def score(self, text):
+        """
+        Return the mean log10 probability of the n-grams in text. English text scores about -4 against the Common
+        model, and random letters and digits about -7.
+        """
+        text = text.lower()
+        count = len(text) - self.n + 1
+        if count < 1:
+            return self.floor
+        get = self.log_probabilities.get
+        floor = self.floor
+        n = self.n
+        return sum(get(text[i:i + n], floor) for i in range(count)) / count
+
+
+@lru_cache(maxsize=None)
+def common_model():
+    """
+    Return the n-gram model of Common, trained on the nouns and adjectives of the Bag of Hoarding.
+    """
+    from telisar.bag_of_hoarding import get_vocabulary
+    vocabulary = get_vocabulary()
+    words = [words[i] for words in (vocabulary.nouns, vocabulary.adjectives) for i in range(len(words))]
+    return NgramModel(words)
+
+
+# the ciphertext, model and cipher of a crack() worker process
+_crack_state = {}
+
+
+def _init_crack(numbers, model):
+    _crack_state.update(numbers=numbers, model=model, cipher=ElethisCipher())
+
+
+def _crack_chunk(keys):
+    """
+    Try each of a list of candidate keys against the ciphertext. Keys that decrypt to numbers outside the tabula recta
+    are rejected outright; the rest are scored. Returns the number of keys tried and a list of (score, key) tuples.
+    """
+    numbers = _crack_state['numbers']
+    score = _crack_state['model'].score
+    cipher = _crack_state['cipher']
+    reverse = cipher._reverse
+    forward = cipher._forward
+    results = []
+    for key in keys:
+        psk = [reverse[x] for x in cipher.normalize(key)]
+        if not psk:
+            continue
+        try:
+            plaintext = cipher._decrypt_values(numbers, psk)[0]
+        except ValueError:
+            continue
+        results.append((score(''.join([forward[x] for x in plaintext])), key))
+    return (len(keys), results)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    return iter(lambda: list(islice(iterator, size)), [])
+
+
+def _read_words(path):
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def crack(ciphertext, wordlist, workers=1, model=None, threshold=-5.0, sample=200, chunk_size=2000, top=5):
+    """
+    Attempt a dictionary attack on a message encrypted with ElethisCipher, trying each word in a word list as the
+    pre-shared key and scoring the resulting plaintext with an n-gram model. Only the first sample numbers of the
+    message are decrypted for each key. The search stops as soon as a key scores at least threshold.
+
+    Args:
+        ciphertext (str or list): The encrypted message, as a string of numbers or a list of them
+        wordlist (str or iterable): The path to a file of candidate keys, one per line, or an iterable of keys
+        workers (int): The number of processes to try keys in
+        model (NgramModel): optional, the model to score plaintext with; defaults to the Common model
+        threshold (float): The score at which a key is accepted and the search stops
+        sample (int): The number of numbers of the message to decrypt with each key
+        chunk_size (int): The number of keys to send to a worker at a time
+        top (int): The number of best-scoring keys to report
+
+    Returns:
+        dict: The best key (or None if no key decrypted the message), whether its score reached the threshold, its
+            plaintext, the best candidates as (score, key) tuples, the number of keys tried, and the throughput in
+            keys per second
+    """
+    if isinstance(ciphertext, str):
+        ciphertext = ciphertext.split()
+    numbers = [int(n) for n in ciphertext]
+    model = model or common_model()
+    if isinstance(wordlist, str):
+        wordlist = _read_words(wordlist)
+
+    started = time.perf_counter()
+    tried = 0
+    best = []
+
+    def collect(results):
+        nonlocal tried
+        (count, scored) = results
+        tried += count
+        for candidate in scored:
+            if len(best) < top:
+                heapq.heappush(best, candidate)
+            else:
+                heapq.heappushpop(best, candidate)
+        return bool(best) and max(best)[0] >= threshold
+
+    chunks = _chunks(wordlist, chunk_size)
+    if workers > 1:
+        with multiprocessing.Pool(workers, initializer=_init_crack, initargs=(numbers[:sample], model)) as pool:
+            for results in pool.imap_unordered(_crack_chunk, chunks):
+                if collect(results):
+                    break
+    else:
+        _init_crack(numbers[:sample], model)
+        for chunk in chunks:
+            if collect(_crack_chunk(chunk)):
+                break
+
+    seconds = time.perf_counter() - started
+    candidates = sorted(best, reverse=True)
+    key = candidates[0][1] if candidates else None
+    plaintext = None
+    if key:
+        try:
+            plaintext = ''.join(ElethisCipher().decrypt(key, ' '.join(map(str, numbers))))
+        except ValueError:
+            # the key only fits the part of the message that was sampled
+            pass
+    return {
+        'key': key,
+        'cracked': bool(candidates) and candidates[0][0] >= threshold,
+        'plaintext': plaintext,
+        'candidates': candidates,
+        'tried': tried,
+        'seconds': seconds,
+        'keys_per_second': int(tried / seconds) if seconds else 0,
+    }
@@ -0,0 +1,60 @@
+"""
+The Telisaran languages.
+
+Language instances compile their grapheme tables when they are created, so long-running processes should share one
+instance per language class by way of get_language() rather than constructing their own.
+"""
+from telisar.languages.base import LanguageException
+from importlib import import_module
+import glob
+import os
+
+
+_language_modules = []
+_instances = {}
+
+
+def list_languages():
+    """
+    Return the names of the available language modules.
+    """
+    if not _language_modules:
+        for filename in glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py')):
+            module_name = os.path.basename(filename)[:-3]
+            if module_name not in ['base', '__init__', 'text']:
+                _language_modules.append(module_name)
+        _language_modules.sort()
+    return _language_modules
+
+
+def get_language(language):
+    """
+    Return the shared instance of a language, importing its module and creating the instance on first use.
+
+    Args:
+        language (str or class): A module name (eg. 'elven'), which refers to the module's primary language class
+            (Elven); a module and class name (eg. 'elven.ElvenPerson'); or a BaseLanguage subclass.
+
+    Returns:
+        BaseLanguage: The language instance
+
+    Raises:
+        LanguageException: If the language does not exist
+    """
+    if isinstance(language, str):
+        (module_name, _, class_name) = language.partition('.')
+        module_name = module_name.lower()
+        if module_name not in list_languages():
+            raise LanguageException(f"Unknown language: {language}")
+        module = import_module(f'telisar.languages.{module_name}')
+        try:
+            language = getattr(module, class_name or module_name.capitalize())
+        except AttributeError:
+            raise LanguageException(f"Unknown language: {language}")
+
+    if language not in _instances:
+        instance = language()
+        # compile the grapheme automaton up front, too
+        instance.automaton
+        _instances[language] = instance
+    return _instances[language]
@@ -1,9 +1,22 @@
 import random
 import logging
+from bisect import bisect_right
 from collections import namedtuple
+from itertools import accumulate
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
 
 grapheme = namedtuple('Grapheme', ['char', 'weight'])
 
+# compiled GraphemeAutomaton instances, keyed by language class
+_automata = {}
+
+# grapheme transition tables for constructive word generation, keyed by language class
+_transitions = {}
+
 
 class LanguageException(Exception):
     """
@@ -11,11 +24,95 @@ class LanguageException(Exception):
     """
 
 
+class GraphemeAutomaton:
+    """
+    A deterministic finite automaton that accepts words consisting of one grapheme from the first set, any number of
+    graphemes from the middle set, and one grapheme from the last set. Graphemes may be more than one character long,
+    so the automaton is compiled by subset construction from a nondeterministic automaton whose states are (part,
+    partial grapheme) pairs; validating a word is then a single pass over its characters.
+    """
+
+    _accept = (3, '')
+
+    def __init__(self, first, middle, last):
+        self._graphemes = [set(first), set(middle), set(last)]
+        self._prefixes = [set(g[:i] for g in graphemes for i in range(1, len(g) + 1)) for graphemes in self._graphemes]
+
+        alphabet = set(''.join(''.join(graphemes) for graphemes in self._graphemes))
+
+        start = frozenset([(0, '')])
+        self._states = {start: 0}
+        self._transitions = [{}]
+        self._accepting = set()
+
+        pending = [start]
+        while pending:
+            state = pending.pop()
+            state_id = self._states[state]
+            if self._accept in state:
+                self._accepting.add(state_id)
+            for char in alphabet:
+                target = self._step(state, char)
+                if not target:
+                    continue
+                if target not in self._states:
+                    self._states[target] = len(self._transitions)
+                    self._transitions.append({})
+                    pending.append(target)
+                self._transitions[state_id][char] = self._states[target]
+
+    def _step(self, state, char):
+        """
+        Compute the set of nondeterministic states reachable from state by consuming char.
+        """
+        target = set()
+        for (part, partial) in state:
+            if part == 3:
+                continue
+            partial = partial + char
+            if partial not in self._prefixes[part]:
+                continue
+            target.add((part, partial))
+            if partial in self._graphemes[part]:
+                if part == 2:
+                    target.add(self._accept)
+                else:
+                    target.add((1, ''))
+                    target.add((2, ''))
+        return frozenset(target)
+
+    def accepts(self, word):
+        state = 0
+        for char in word:
+            state = self._transitions[state].get(char)
+            if state is None:
+                return False
+        return state in self._accepting
+
+
 class SyllableFactory:
+    """
+    Generate syllables from a template of grapheme indicators. The cumulative weights of every grapheme class and of
+    the syllable counts are computed once at construction time, so each draw is a single bisect of a cached table.
+
+    All random choices are made using the rng instance (a random.Random), so a seeded factory will always produce the
+    same sequence of syllables.
+
+    If a junction predicate is given, get_after() generates syllables that continue a partial word, drawing each
+    grapheme only from those the predicate allows after the last junction_length - 1 characters and from which the
+    word can still be completed. The allowed graphemes for each (characters, slot, syllables remaining) state are
+    computed on first use and kept in the transitions table, which may be shared between factories with the same
+    template, graphemes and predicate.
+    """
 
-    def __init__(self, template, weights, prefixes, vowels, consonants, suffixes, affixes):
+    def __init__(self, template, weights, prefixes, vowels, consonants, suffixes, affixes, rng=None,
+                 junction=None, junction_length=0, transitions=None):
         self.template = template
         self.weights = weights
+        self.random = rng or random.Random()
+        self.junction = junction
+        self.junction_length = junction_length
+        self.transitions = {} if transitions is None else transitions
         self.grapheme = {
             'chars': {
                 'p': [x.char for x in prefixes],
@@ -33,6 +130,17 @@ class SyllableFactory:
             }
         }
 
+        # (chars, cumulative weights) for each grapheme class
+        self._samplers = dict(
+            (key, (chars, list(accumulate(self.grapheme['weights'][key]))))
+            for (key, chars) in self.grapheme['chars'].items()
+        )
+
+        # (optional, grapheme classes) for each slot in the template
+        self._slots = [(t.islower(), t.lower().split('|')) for t in self.template]
+
+        self._lengths = (list(range(1, len(self.weights) + 1)), list(accumulate(self.weights)))
+
     def _filtered_graphemes(self, key):
         return [(k, v) for (k, v) in self.grapheme['chars'].items() if k in key]
 
@@ -47,42 +155,189 @@ class SyllableFactory:
                 return True
         return False
 
+    def _draw(self, sampler):
+        """
+        Choose a weighted random member of a (chars, cumulative weights) sampler.
+        """
+        (chars, cum_weights) = sampler
+        return chars[bisect_right(cum_weights, self.random.random() * cum_weights[-1])]
+
+    def length(self):
+        """
+        Choose a random number of syllables for a word, according to the syllable weights.
+        """
+        return self._draw(self._lengths)
+
     def get(self):
         """
         Generate a single syllable
         """
         syllable = ''
-        for t in self.template:
-            if t.islower() and random.random() < 0.5:
+        for (optional, keys) in self._slots:
+            if optional and self.random.random() < 0.5:
                 continue
-            if '|' in t:
-                t = random.choice(t.split('|'))
-            t = t.lower()
-            syllable = syllable + random.choices(self.grapheme['chars'][t], self.grapheme['weights'][t])[0]
+            key = keys[0] if len(keys) == 1 else self.random.choice(keys)
+            syllable = syllable + self._draw(self._samplers[key])
         return syllable
 
+    def _tail(self, chars):
+        keep = self.junction_length - 1
+        return chars[len(chars) - keep:] if keep > 0 else ''
+
+    def _state(self, tail, slot, remaining):
+        """
+        Return whether a slot may be skipped after tail, and a list of samplers, one per grapheme class, of the
+        graphemes that may fill it. Either way, the rest of the syllable and the remaining syllables can still be
+        completed.
+        """
+        state = (tail, slot, remaining)
+        if state not in self.transitions:
+            (optional, keys) = self._slots[slot]
+            samplers = []
+            for key in keys:
+                (chars, cum_weights) = self._samplers[key]
+                weights = [b - a for (a, b) in zip([0] + cum_weights, cum_weights)]
+                allowed = [
+                    (char, weight) for (char, weight) in zip(chars, weights)
+                    if self.junction(tail + char) and self._viable(self._tail(tail + char), slot + 1, remaining)
+                ]
+                if allowed:
+                    samplers.append(([char for (char, _) in allowed], list(accumulate(w for (_, w) in allowed))))
+            self.transitions[state] = (optional and self._viable(tail, slot + 1, remaining), samplers)
+        return self.transitions[state]
+
+    def _viable(self, tail, slot, remaining):
+        """
+        Return True if the syllable can be completed from slot on after tail, followed by remaining more syllables.
+        """
+        if slot == len(self._slots):
+            return remaining == 0 or self._viable(tail, 0, remaining - 1)
+        (skippable, samplers) = self._state(tail, slot, remaining)
+        return skippable or bool(samplers)
+
+    def get_after(self, chars, remaining=0):
+        """
+        Generate a single syllable to follow chars, the partial word so far, without producing any junction the
+        junction predicate rejects, and such that remaining more syllables can follow it. Optional slots are skipped
+        when they cannot be filled, and filled when they cannot be skipped. Returns None if no such syllable exists.
+        """
+        syllable = ''
+        tail = self._tail(chars)
+        transitions = self.transitions
+        for slot in range(len(self._slots)):
+            (skippable, samplers) = transitions.get((tail, slot, remaining)) or self._state(tail, slot, remaining)
+            if skippable and (not samplers or self.random.random() < 0.5):
+                continue
+            if not samplers:
+                return None
+            char = self._draw(samplers[0] if len(samplers) == 1 else self.random.choice(samplers))
+            syllable = syllable + char
+            tail = self._tail(tail + char)
+        return syllable
+
+    def get_many(self, count):
+        """
+        Generate a list of count syllables in one vectorized pass. Requires numpy.
+
+        Each template slot is filled for every syllable at once: optional slots are masked with a single uniform draw,
+        slots with alternatives choose a grapheme class per syllable, and graphemes are chosen by searching the
+        cumulative weights. The NumPy generator is seeded from this factory's random number generator, so a seeded
+        factory produces the same batches.
+        """
+        if numpy is None:
+            raise LanguageException("SyllableFactory.get_many() requires numpy.")
+
+        rng = numpy.random.default_rng(self.random.getrandbits(64))
+        empty = numpy.full(count, '', dtype=object)
+        syllables = empty
+
+        for (optional, keys) in self._slots:
+            column = empty
+            choice = rng.integers(len(keys), size=count) if len(keys) > 1 else numpy.zeros(count, dtype=int)
+            for (i, key) in enumerate(keys):
+                (chars, cum_weights) = self._samplers[key]
+                cum_weights = numpy.array(cum_weights, dtype=float)
+                indices = numpy.searchsorted(cum_weights, rng.random(count) * cum_weights[-1], side='right')
+                column = numpy.where(choice == i, numpy.array(chars, dtype=object)[indices], column)
+            if optional:
+                column = numpy.where(rng.random(count) < 0.5, empty, column)
+            syllables = syllables + column
+
+        return syllables.tolist()
+
     def __str__(self):
         return self.get()
 
 
 class WordFactory:
+    """
+    Generate words from a language's syllables. Two modes are supported:
+
+        rejection    - generate whole sequences of syllables until one passes the language's validate_sequence()
+        constructive - build the word one grapheme at a time, drawing each grapheme only from those the language's
+                       valid_junction() allows after the characters before it, so invalid junctions are never
+                       produced; the finished word must still pass validate_sequence().
+
+    The mode defaults to the language's word_mode. In either mode, every word that is discarded before one is accepted
+    counts as one retry in the language's word_stats.
+    """
+
+    # the number of words to discard in constructive mode before giving up
+    max_restarts = 100
 
-    def __init__(self, language):
+    def __init__(self, language, mode=None):
         self.language = language
+        self.mode = mode or language.word_mode
 
     def random_syllable_count(self):
-        return 1 + random.choices(range(len(self.language.syllable.weights)), self.language.syllable.weights)[0]
+        return self.language.syllable.length()
 
-    def get(self):
+    def _random_sequence(self, total_syllables):
+        seq = [self.language.syllable.get()]
+        while len(seq) < total_syllables - 2:
+            seq.append(self.language.syllable.get())
+        if len(seq) < total_syllables:
+            seq.append(self.language.syllable.get())
+        return seq
 
-        total_syllables = self.random_syllable_count()
-        seq = []
+    def _reject(self, total_syllables):
+        """
+        Generate complete sequences of syllables until one is valid.
+        """
+        seq = self._random_sequence(total_syllables)
         while not self.language.validate_sequence(seq, total_syllables):
-            seq = [self.language.syllable.get()]
-            while len(seq) < total_syllables - 2:
-                seq.append(self.language.syllable.get())
-            if len(seq) < total_syllables:
-                seq.append(self.language.syllable.get())
+            self.language.word_stats['retries'] += 1
+            seq = self._random_sequence(total_syllables)
+        return seq
+
+    def _construct(self, total_syllables):
+        """
+        Build a sequence of syllables in which every junction is valid, starting over if the word fails
+        validate_sequence() (if it is too short, for example).
+        """
+        syllable = self.language.syllable
+        for _ in range(self.max_restarts):
+            seq = []
+            chars = ''
+            while len(seq) < total_syllables:
+                part = syllable.get_after(chars, total_syllables - len(seq) - 1)
+                if part is None:
+                    break
+                seq.append(part)
+                chars = chars + part
+            if len(seq) == total_syllables and self.language.validate_sequence(seq, total_syllables):
+                return seq
+            self.language.word_stats['retries'] += 1
+        raise LanguageException(
+            f"Could not construct a valid {total_syllables}-syllable word in {self.max_restarts} attempts.")
+
+    def get(self):
+        total_syllables = self.random_syllable_count()
+        if self.mode == 'constructive':
+            seq = self._construct(total_syllables)
+        else:
+            seq = self._reject(total_syllables)
+        self.language.word_stats['words'] += 1
         return ''.join(seq)
 
     def __str__(self):
@@ -127,8 +382,17 @@ class BaseLanguage:
 
     minimum_length = 3
 
-    def __init__(self):
+    # how WordFactory generates words; one of 'rejection' or 'constructive'
+    word_mode = 'rejection'
+
+    # the number of characters valid_junction() examines; constructive generation requires at least 2
+    junction_length = 0
+
+    def __init__(self, seed=None, rng=None):
         self._logger = logging.getLogger()
+        self.random = rng or random.Random(seed)
+        self.word_stats = {'words': 0, 'retries': 0}
+        self._sublanguages = {}
 
         self.syllable = SyllableFactory(
             template=self.syllable_template,
@@ -137,53 +401,96 @@ class BaseLanguage:
             suffixes=[grapheme(char=c, weight=1) for c in self.__class__.suffixes],
             vowels=[grapheme(char=c, weight=1) for c in self.__class__.vowels],
             consonants=[grapheme(char=c, weight=1) for c in self.__class__.consonants],
-            affixes=[grapheme(char=c, weight=1) for c in self.__class__.affixes]
+            affixes=[grapheme(char=c, weight=1) for c in self.__class__.affixes],
+            rng=self.random,
+            junction=self.valid_junction,
+            junction_length=self.junction_length,
+            transitions=_transitions.setdefault(self.__class__, {}),
         )
 
+    def seed(self, value=None):
+        """
+        Reseed the random number generator shared by this language and its syllable factory.
+        """
+        self.random.seed(value)
 
-    def _valid_syllable(self, syllable, text, key='apcvs', reverse=False):
-        length = 0
-        for seq in reverse(sorted(syllable.graphemes(key=key), key=len)):
-            length = len(seq)
-            substr = text[-1 * length:] if reverse else text[0:length]
-            if substr == seq:
-                return length
-        return False
+    def sublanguage(self, language_class):
+        """
+        Return a cached instance of another language class (a surname or place name language, for example) that
+        shares this language's random number generator.
+        """
+        if language_class not in self._sublanguages:
+            self._sublanguages[language_class] = language_class(rng=self.random)
+        return self._sublanguages[language_class]
+
+    @property
+    def retries_per_word(self):
+        """
+        The average number of retries WordFactory needed for each word it accepted.
+        """
+        if not self.word_stats['words']:
+            return 0
+        return self.word_stats['retries'] / self.word_stats['words']
+
+    @property
+    def automaton(self):
+        """
+        The GraphemeAutomaton for this language, compiled once per language class. Words begin with one of the
+        first_vowels or first_consonants and end with one of the last_vowels or last_consonants; languages that don't
+        define these may begin with any prefix and end with any suffix, vowel or consonant.
+        """
+        klass = self.__class__
+        if klass not in _automata:
+            graphemes = list(klass.vowels) + list(klass.consonants)
+
+            first = list(getattr(klass, 'first_vowels', [])) + list(getattr(klass, 'first_consonants', []))
+            last = list(getattr(klass, 'last_vowels', [])) + list(getattr(klass, 'last_consonants', []))
+
+            _automata[klass] = GraphemeAutomaton(
+                first=first or list(klass.prefixes) + graphemes,
+                middle=graphemes,
+                last=last or list(klass.suffixes) + graphemes,
+            )
+        return _automata[klass]
 
     def is_valid(self, text):
+        """
+        Return True if every part of the text is either an affix or a word of at least minimum_length characters that
+        the language's grapheme automaton accepts.
+        """
+        affixes = set(self.affixes) | set(getattr(self, 'first_affixes', [])) | set(getattr(self, 'last_affixes', []))
+        automaton = self.automaton
 
         for part in text.lower().split(' '):
 
-            if part in self.affixes:
+            if part in affixes:
                 continue
 
             if len(part) < self.minimum_length:
                 self._logger.debug(f"'{part}' too short; must be {self.minimum_length} characters.")
                 return False
 
-            first_offset = self._valid_syllable(self.syllable, text=part, key='p')
-            if first_offset is False:
-                self._logger.debug(f"'{part}' is not a valid syllable.")
-                return False
-
-            last_offset = self._valid_syllable(self.last_syllable, text=part, key='s', reverse=True)
-            if last_offset is False:
-                self._logger.debug(f"'{part}' is not a valid syllable.")
+            if not automaton.accepts(part):
+                self._logger.debug(f"'{part}' is not a valid sequence of graphemes.")
                 return False
-            last_offset = len(part) - last_offset
-
-            while first_offset < last_offset:
-                middle = part[first_offset:last_offset]
-                new_offset = self._valid_syllable(self.syllable, text=middle, key='cv')
-                if new_offset is False:
-                    self._logger.debug(f"'{middle}' is not a valid middle sequence.")
-                    return False
-                first_offset = first_offset + new_offset
         return True
 
+    def validate_many(self, words):
+        """
+        Validate a list of words, returning a list of booleans.
+        """
+        return [self.is_valid(word) for word in words]
+
     def validate_sequence(self, sequence, total_syllables):
         return len(''.join(sequence)) > self.minimum_length
 
+    def valid_junction(self, chars):
+        """
+        Return False if chars, up to junction_length characters ending in a candidate grapheme, contain a sequence
+        the language never allows anywhere in a word. Used by constructive word generation.
+        """
+        return True
+
     def word(self):
         return WordFactory(language=self)
 
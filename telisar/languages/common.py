@@ -1,5 +1,4 @@
 import re
-import random
 from telisar.languages.base import BaseLanguage, WordFactory
 
 
@@ -47,6 +46,9 @@ class Common(BaseLanguage):
 
     minimum_length = 1
 
+    word_mode = 'constructive'
+    junction_length = 4
+
     def validate_sequence(self, sequence, total_syllables):
         too_short = len(''.join(sequence)) < self.minimum_length
         if too_short:
@@ -66,6 +68,14 @@ class Common(BaseLanguage):
                 self._logger.debug(f"Invalid sequence: {seq}")
                 return False
 
+    def valid_junction(self, chars):
+        """
+        Reject runs of three vowels or four consonants, and any pair of letters not in the middle clusters.
+        """
+        if self._invalid_sequences.search(chars):
+            return False
+        return all(self._middle_clusters.match(chars[i:i + 2]) for i in range(len(chars) - 1))
+
 
 class CommonSurname(Common):
 
@@ -80,7 +90,7 @@ class CommonSurname(Common):
     ]
 
     def word(self):
-        return str(WordFactory(self)) + random.choice(self.word_suffixes)
+        return str(WordFactory(self)) + self.random.choice(self.word_suffixes)
 
 
 class CommonPerson(Common):
@@ -91,4 +101,4 @@ class CommonPerson(Common):
     minimum_length = 2
 
     def person(self):
-        return (WordFactory(language=self), CommonSurname().word())
+        return (WordFactory(language=self), self.sublanguage(CommonSurname).word())
@@ -1,5 +1,4 @@
 from telisar.languages.base import BaseLanguage, WordFactory
-import random
 import re
 
 
@@ -57,9 +56,9 @@ class Dragon(Draconic):
         suffix = ''
         while not self.validate_sequence(suffix, 1):
             suffix = ''.join([
-                random.choice(self.last_vowels),
-                random.choice(self.last_consonants),
-                random.choice(['us', 'ux', 'as', 'ax', 'is', 'ix', 'es', 'ex'])
+                self.random.choice(self.last_vowels),
+                self.random.choice(self.last_consonants),
+                self.random.choice(['us', 'ux', 'as', 'ax', 'is', 'ix', 'es', 'ex'])
 
             ])
         return [prefix + suffix]
@@ -1,5 +1,3 @@
-import random
-
 from telisar.languages.base import BaseLanguage
 
 
@@ -31,12 +29,12 @@ class Dwarvish(BaseLanguage):
 
     def person(self):
         words = super().person()
-        suffix = random.choice(Dwarvish.name_suffixes)
+        suffix = self.random.choice(Dwarvish.name_suffixes)
         return (str(words[0]), f"{words[1]}{suffix}")
 
     def is_valid(self, text):
         for suffix in self.name_suffixes:
             if text.endswith(suffix):
-                text = text[0:len(suffix)]
+                text = text[:-len(suffix)]
                 break
         return super().is_valid(text)
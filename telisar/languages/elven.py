@@ -1,4 +1,3 @@
-import random
 import re
 
 from telisar.languages.base import BaseLanguage, WordFactory
@@ -25,6 +24,9 @@ class Elven(BaseLanguage):
     syllable_template = ('c', 'v', 'c', 'V', 'C', 'v')
     minimum_length = 4
 
+    word_mode = 'constructive'
+    junction_length = 4
+
     _valid_consonant_sequences = [
         'cc', 'ht', 'kd', 'kl', 'km', 'kp', 'kt', 'kv', 'kw', 'ky', 'lc', 'ld',
         'lf', 'll', 'lm', 'lp', 'lt', 'lv', 'lw', 'ly', 'mb', 'mm', 'mp', 'my',
@@ -65,6 +67,17 @@ class Elven(BaseLanguage):
 
         return True
 
+    def valid_junction(self, chars):
+        """
+        Reject runs of three vowels or four consonants, and any pair of consonants not in the valid sequences.
+        """
+        if self._invalid_sequences.search(chars):
+            return False
+        for (a, b) in zip(chars, chars[1:]):
+            if a in self.consonants and b in self.consonants and a + b not in self._valid_consonant_sequences:
+                return False
+        return True
+
 
 class ElvenPlaceName(Elven):
     """
@@ -84,8 +97,8 @@ class ElvenPlaceName(Elven):
         suffix = []
         while not self.validate_sequence(suffix):
             suffix = [
-                random.choice(self.last_vowels),
-                random.choice(self.last_consonants + ['ss']),
+                self.random.choice(self.last_vowels),
+                self.random.choice(self.last_consonants + ['ss']),
             ]
         return prefix + ''.join(suffix)
 
@@ -110,14 +123,14 @@ class HighElvenSurname(Elven):
         suffix = ''
         while not self.validate_sequence(suffix):
             suffix = ''.join([
-                random.choice(self.last_vowels),
-                random.choice(self.last_consonants + ['ss']),
-                random.choice([
+                self.random.choice(self.last_vowels),
+                self.random.choice(self.last_consonants + ['ss']),
+                self.random.choice([
                     'ie',
                     'ia',
                     'io',
                 ]),
-                random.choice(['th', 's', 'r', 'n'])
+                self.random.choice(['th', 's', 'r', 'n'])
             ])
         return prefix + suffix
 
@@ -132,15 +145,18 @@ class ElvenPerson(Elven):
     syllable_template = ('c', 'V', 'C', 'v')
     syllable_weights = [1, 2]
 
+    # given names may be as short as Ara
+    minimum_length = 3
+
     last_affixes = ['am', 'an', 'al', 'um']
 
     def place(self):
-        return ElvenPlaceName().word()
+        return self.sublanguage(ElvenPlaceName).word()
 
     def word(self):
         return (
             super().word(),
-            random.choice(self.last_affixes),
+            self.random.choice(self.last_affixes),
             self.place()
         )
 
@@ -159,8 +175,8 @@ class HighElvenPerson(ElvenPerson):
     def word(self):
         return (
             super(Elven, self).word(),
-            random.choice(self.last_affixes),
-            HighElvenSurname().word()
+            self.random.choice(self.last_affixes),
+            self.sublanguage(HighElvenSurname).word()
         )
 
     person = word
@@ -1,5 +1,4 @@
 from telisar.languages.base import BaseLanguage
-import random
 import re
 
 
@@ -72,7 +71,7 @@ class Tiefling(Infernal):
     ] + ['' for _ in range(50)]
 
     def person(self):
-        suffix = random.choice([
+        suffix = self.random.choice([
             'us',
             'ius'
             'to',
@@ -93,7 +92,7 @@ class HighTiefling(Tiefling):
     nicknames = []
 
     def person(self):
-        bloodline = random.choice([
+        bloodline = self.random.choice([
             'Asmodeus',
             'Baalzebul',
             'Rimmon',
@@ -0,0 +1,90 @@
+"""
+Streaming generators for flavor text in any of the Telisaran languages.
+"""
+
+
+def phrases(language, words):
+    """
+    Yield phrases of 1 to 12 words containing a total of the specified number of words.
+
+    Args:
+        language (BaseLanguage): The language instance to generate words with
+        words (int): The total number of words to generate
+
+    Returns:
+        generator: A generator yielding phrases as strings
+    """
+    phrase = []
+    for _ in range(words):
+        phrase.append(str(language.word()))
+        if len(phrase) >= language.random.randint(1, 12):
+            yield ' '.join(phrase)
+            phrase = []
+    if phrase:
+        yield ' '.join(phrase)
+
+
+def sentences(language, words):
+    """
+    Yield sentences of flavor text containing a total of the specified number of words. Each phrase either continues
+    the current sentence after a comma or starts a new one. Only the sentence being built is held in memory, so any
+    number of words may be generated.
+
+    Args:
+        language (BaseLanguage): The language instance to generate words with
+        words (int): The total number of words to generate
+
+    Returns:
+        generator: A generator yielding sentences as strings
+    """
+    sentence = None
+    for phrase in phrases(language, words):
+        if sentence is None:
+            sentence = phrase.capitalize()
+        elif language.random.choice([0, 0, 1]):
+            yield sentence + language.random.choice('?!.')
+            sentence = phrase.capitalize()
+        else:
+            sentence = sentence + ', ' + phrase
+    if sentence is not None:
+        yield sentence + '.'
+
+
+def paragraphs(language, words, length=5):
+    """
+    Yield paragraphs of flavor text, each containing up to length sentences.
+
+    Args:
+        language (BaseLanguage): The language instance to generate words with
+        words (int): The total number of words to generate
+        length (int): The number of sentences per paragraph
+
+    Returns:
+        generator: A generator yielding paragraphs as strings
+    """
+    paragraph = []
+    for sentence in sentences(language, words):
+        paragraph.append(sentence)
+        if len(paragraph) == length:
+            yield ' '.join(paragraph)
+            paragraph = []
+    if paragraph:
+        yield ' '.join(paragraph)
+
+
+def write(language, words, filehandle, paragraph_length=None):
+    """
+    Stream flavor text to a file handle as it is generated. Sentences are separated by spaces; if paragraph_length
+    is specified, a blank line is written between each group of that many sentences.
+
+    Args:
+        language (BaseLanguage): The language instance to generate words with
+        words (int): The total number of words to generate
+        filehandle (file): The file-like object to write to
+        paragraph_length (int): The number of sentences per paragraph, or None for a single paragraph
+    """
+    for (i, sentence) in enumerate(sentences(language, words)):
+        if i:
+            filehandle.write('\n\n' if paragraph_length and i % paragraph_length == 0 else ' ')
+        filehandle.write(sentence)
+    filehandle.write('\n')
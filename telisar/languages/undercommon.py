@@ -1,4 +1,3 @@
-import random
 import re
 
 from telisar.languages.base import BaseLanguage, WordFactory
@@ -75,8 +74,8 @@ class DrowPlaceName(Undercommon):
         suffix = []
         while not self.validate_sequence(suffix):
             suffix = [
-                random.choice(self.last_vowels),
-                random.choice(self.last_consonants + ['ss']),
+                self.random.choice(self.last_vowels),
+                self.random.choice(self.last_consonants + ['ss']),
             ]
         return prefix + ''.join(suffix)
 
@@ -94,14 +93,14 @@ class DrowSurname(Undercommon):
         suffix = ''
         while not self.validate_sequence(suffix):
             suffix = ''.join([
-                random.choice(self.last_vowels),
-                random.choice(self.last_consonants + ['ss']),
-                random.choice([
+                self.random.choice(self.last_vowels),
+                self.random.choice(self.last_consonants + ['ss']),
+                self.random.choice([
                     'ie',
                     'ia',
                     'io',
                 ]),
-                random.choice(['th', 's', 'r', 'n'])
+                self.random.choice(['th', 's', 'r', 'n'])
             ])
         return prefix + suffix
 
@@ -111,12 +110,12 @@ class DrowPerson(Undercommon):
     syllable_weights = [1, 2]
 
     def place(self):
-        return DrowPlaceName().word()
+        return self.sublanguage(DrowPlaceName).word()
 
     def word(self):
         return (
             super().word(),
-            DrowSurname().word(),
+            self.sublanguage(DrowSurname).word(),
         )
 
     person = word
@@ -1,5 +1,6 @@
 from importlib import import_module
 from telisar.npc import traits
+import multiprocessing
 import os
 import glob
 import random
@@ -94,14 +95,45 @@ class BaseNPC:
             self._names = [str(x) for x in self.language.person()]
         return self._names
 
+    @classmethod
+    def format_name(cls, names):
+        """
+        Format a sequence of names generated by the NPC's language as a single name.
+        """
+        return ' '.join([str(n).capitalize() for n in names])
+
+    @classmethod
+    def compose_name(cls, names, title=None, nickname=None):
+        """
+        Combine a sequence of names, an optional title and an optional nickname into a full name.
+        """
+        name = cls.format_name(names)
+        if title:
+            name = title.capitalize() + ' ' + name
+        if nickname:
+            name = f'{name} "{nickname}"'
+        return name
+
+    @classmethod
+    def random_nickname(cls, language, rng=random):
+        """
+        Choose a nickname from the language's nicknames using rng, or return False if the language has none.
+        """
+        try:
+            return rng.choice(language.nicknames).capitalize()
+        except (AttributeError, IndexError):
+            return False
+
+    @classmethod
+    def random_full_name(cls, language, rng=random):
+        """
+        Return a random full name, including any nickname, generated by language without creating an NPC.
+        """
+        return cls.compose_name(language.person(), nickname=cls.random_nickname(language, rng))
+
     @property
     def full_name(self):
-        name = ' '.join([n.capitalize() for n in self.names])
-        if self.title:
-            name = self.title.capitalize() + ' ' + name
-        if self.nickname:
-            name = f'{name} "{self.nickname}"'
-        return name
+        return self.compose_name(self.names, self.title, self.nickname)
 
     @property
     def pronouns(self):
@@ -119,11 +151,8 @@ class BaseNPC:
 
     @property
     def nickname(self):
-        if self._nickname is None and hasattr(self.language, 'nicknames'):
-            try:
-                self._nickname = random.choice(self.language.nicknames).capitalize()
-            except IndexError:
-                self._nickname = False
+        if self._nickname is None:
+            self._nickname = self.random_nickname(self.language)
         return self._nickname
 
     @property
@@ -335,24 +364,71 @@ def available_npc_types():
     if not _available_npc_types:
         for filename in glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py')):
             module_name = os.path.basename(filename)[:-3]
-            if module_name not in ['base', '__init__', 'traits']:
+            if module_name not in ['base', '__init__', 'traits', 'namebank']:
                 _available_npc_types[module_name] = import_module(f'telisar.npc.{module_name}').NPC
     return _available_npc_types
 
 
-def npc_type(ancestry=None):
+def npc_type(ancestry=None, rng=random):
     """
     Return the NPC class for the specified ancestry, or a random one.
     """
     if not ancestry:
         non_humans = [x for x in available_npc_types() if x != 'human']
-        if random.random() <= 0.7:
+        if rng.random() <= 0.7:
             ancestry = 'human'
         else:
-            ancestry = random.choice(non_humans)
+            ancestry = rng.choice(non_humans)
     return available_npc_types()[ancestry]
 
 
+def _generate_name_chunk(chunk):
+    """
+    Generate a list of full names from an (ancestry, count, seed) tuple. The chunk creates its own instance of each
+    language it needs, and every random choice is made with a generator seeded from the chunk's seed, so a chunk always
+    produces the same names no matter which process generates it, and the shared language instances are left alone.
+    """
+    (ancestry, count, seed) = chunk
+    rng = random.Random(seed)
+    languages = {}
+
+    names = []
+    for _ in range(count):
+        npc_class = npc_type(ancestry, rng=rng)
+        language_class = npc_class.language.__class__
+        if language_class not in languages:
+            languages[language_class] = language_class(rng=rng)
+        names.append(npc_class.random_full_name(languages[language_class], rng))
+    return names
+
+
+def generate_names(ancestry=None, count=1, workers=1, seed=None, chunk_size=1000):
+    """
+    Generate count random NPC full names, including any title and nickname, of the specified ancestry (or of random
+    ancestries).
+
+    Names are generated in chunks of chunk_size, each with its own seed derived from seed, and yielded in order as
+    each chunk completes. If workers is greater than 1 the chunks are spread across a pool of processes; for a given
+    seed the names are the same regardless of the number of workers.
+    """
+    if ancestry:
+        npc_type(ancestry)
+
+    rng = random.Random(seed)
+    chunks = [
+        (ancestry, min(chunk_size, count - start), rng.getrandbits(64))
+        for start in range(0, count, chunk_size)
+    ]
+
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            for names in pool.imap(_generate_name_chunk, chunks):
+                yield from names
+    else:
+        for chunk in chunks:
+            yield from _generate_name_chunk(chunk)
+
+
 def generate_npc(ancestry=None, names=[], pronouns=None, title=None, nickname=None, whereabouts="Unknown",
                  STR=0, DEX=0, CON=0, INT=0, WIS=0, CHA=0, randomize=False):
     """
@@ -1,4 +1,4 @@
-from telisar.languages import draconic
+from telisar.languages import draconic, get_language
 from telisar.npc.base import BaseNPC, a_or_an
 from telisar.npc import traits
 import textwrap
@@ -8,7 +8,7 @@ import random
 class NPC(BaseNPC):
 
     ancestry = 'Dragon'
-    language = draconic.Dragon()
+    language = get_language(draconic.Dragon)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -18,11 +18,9 @@ class NPC(BaseNPC):
         self._fangs = None
         self._wings = None
 
-    @property
-    def nickname(self):
-        if not self._nickname:
-            self._nickname = "the " + random.choice(traits.personality)
-        return self._nickname
+    @classmethod
+    def random_nickname(cls, language, rng=random):
+        return "the " + rng.choice(traits.personality)
 
     @property
     def age(self):
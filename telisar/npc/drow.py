@@ -1,15 +1,15 @@
-from telisar.languages import undercommon
+from telisar.languages import undercommon, get_language
 from telisar.npc.base import BaseNPC
 
 
 class NPC(BaseNPC):
 
     ancestry = 'Drow'
-    language = undercommon.DrowPerson()
+    language = get_language(undercommon.DrowPerson)
 
-    @property
-    def full_name(self):
+    @classmethod
+    def compose_name(cls, names, title=None, nickname=None):
         return ' '.join([
-            str(self.names[0]).capitalize(),
-            str(self.names[1]).capitalize()
+            str(names[0]).capitalize(),
+            str(names[1]).capitalize()
         ])
@@ -1,12 +1,12 @@
-from telisar.languages import dwarvish
+from telisar.languages import dwarvish, get_language
 from telisar.npc.base import BaseNPC
 
 
 class NPC(BaseNPC):
 
     ancestry = 'Dwarf'
-    language = dwarvish.Dwarvish()
+    language = get_language(dwarvish.Dwarvish)
 
-    @property
-    def full_name(self):
-        return ' '.join([str(x).capitalize() for x in self.language.person()])
+    @classmethod
+    def compose_name(cls, names, title=None, nickname=None):
+        return cls.format_name(names)
@@ -1,16 +1,20 @@
-from telisar.languages import elven
+from telisar.languages import elven, get_language
 from telisar.npc.base import BaseNPC
 
 
 class NPC(BaseNPC):
 
     ancestry = 'Elf'
-    language = elven.ElvenPerson()
+    language = get_language(elven.ElvenPerson)
 
-    @property
-    def full_name(self):
+    @classmethod
+    def format_name(cls, names):
         return ' '.join([
-            str(self.names[0]).capitalize(),
-            str(self.names[1]).lower(),
-            str(self.names[2]).capitalize()
+            str(names[0]).capitalize(),
+            str(names[1]).lower(),
+            str(names[2]).capitalize()
         ])
+
+    @classmethod
+    def compose_name(cls, names, title=None, nickname=None):
+        return cls.format_name(names)
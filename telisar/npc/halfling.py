@@ -1,10 +1,10 @@
 import random
 
-from telisar.languages import halfling
+from telisar.languages import halfling, get_language
 from telisar.npc.base import BaseNPC
 
 
 class NPC(BaseNPC):
 
     ancestry = 'Halfling'
-    language = halfling.Halfling()
+    language = get_language(halfling.Halfling)
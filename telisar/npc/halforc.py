@@ -1,12 +1,12 @@
-from telisar.languages import orcish
+from telisar.languages import orcish, get_language
 from telisar.npc.base import BaseNPC
 
 
 class NPC(BaseNPC):
 
     ancestry = 'Half-Orc'
-    language = orcish.HalfOrcPerson()
+    language = get_language(orcish.HalfOrcPerson)
 
-    @property
-    def full_name(self):
-        return ' '.join([str(x).capitalize() for x in self.language.person()])
+    @classmethod
+    def compose_name(cls, names, title=None, nickname=None):
+        return cls.format_name(names)
@@ -1,6 +1,6 @@
-from telisar.languages import infernal
+from telisar.languages import infernal, get_language
 from telisar.npc import tiefling
 
 
 class NPC(tiefling.NPC):
-    language = infernal.HighTiefling()
+    language = get_language(infernal.HighTiefling)
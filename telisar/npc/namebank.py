@@ -0,0 +1,303 @@
+"""
+A persistent bank of pre-generated, unique NPC names.
+"""
+from telisar.npc.base import generate_names, npc_type
+from array import array
+from contextlib import contextmanager
+import mmap
+import os
+import random
+import struct
+import threading
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+DEFAULT_PATH = '~/.telisar_namebank'
+
+_header = struct.Struct('<4sII')
+_magic = b'TNB2'
+_used_field = struct.Struct('<I')
+_used_offset = _header.size - _used_field.size
+
+# the first layout had no count of used names; banks in it are converted when they are opened
+_header_v1 = struct.Struct('<4sI')
+_magic_v1 = b'TNB1'
+
+_banks = {}
+
+
+class NameBankError(Exception):
+    """
+    Thrown when a name bank cannot supply any more unique names.
+    """
+
+
+def _pack(names, used=()):
+    """
+    Serialize a collection of names as a name bank. The names are deduplicated and sorted, and any names in the used
+    collection are marked as used.
+
+    The layout is a header (magic, count, number of used names), a bitmap of used names padded to a multiple of 4
+    bytes, count + 1 unsigned int offsets into the blob, and a blob of the UTF-8 encoded names.
+    """
+    names = sorted(set(names))
+    used = set(used)
+    encoded = [name.encode('utf-8') for name in names]
+
+    bitmap = bytearray(((len(names) + 31) // 32) * 4)
+    offsets = array('I', [0])
+    used_count = 0
+    for (i, name) in enumerate(names):
+        offsets.append(offsets[-1] + len(encoded[i]))
+        if name in used:
+            bitmap[i >> 3] |= 1 << (i & 7)
+            used_count += 1
+
+    return _header.pack(_magic, len(names), used_count) + bytes(bitmap) + offsets.tobytes() + b''.join(encoded)
+
+
+class NameBank:
+    """
+    A store of unique names for one NPC ancestry, saved to a single file named for the ancestry's language. The file
+    is memory-mapped; names are decoded only when they are served, and serving a name sets its bit in the used-name
+    bitmap in place, and increments the count of used names in the header, so used names stay used across processes
+    and restarts. Serving and refilling hold an exclusive lock on the bank, and a process remaps the file if another
+    process has replaced it since it was last mapped.
+
+    get() picks names at random and probes the bitmap, which takes O(1) attempts while most names are unused. Once
+    the fraction of used names reaches low_water, a background thread generates another batch of names, merges it
+    into the store and atomically replaces the file.
+    """
+
+    def __init__(self, ancestry, path=None, size=10000, low_water=0.5, workers=1):
+        """
+        Args:
+            ancestry (str): The NPC ancestry (eg. 'human', 'elf') whose names the bank holds
+            path (str): The directory for name bank files; defaults to NAMEBANK_PATH from the environment
+            size (int): The number of names to generate each time the bank is filled
+            low_water (float): The fraction of used names that triggers a refill
+            workers (int): The number of processes to generate names with
+        """
+        self.ancestry = ancestry
+        self.language = npc_type(ancestry).language.__class__.__name__
+        self.path = os.path.expanduser(os.path.expandvars(path or os.getenv('NAMEBANK_PATH', DEFAULT_PATH)))
+        self.filename = os.path.join(self.path, f'{self.language}.bank')
+        self.size = size
+        self.low_water = low_water
+        self.workers = workers
+
+        self._random = random.Random()
+        self._lock = threading.Lock()
+        self._refill_thread = None
+        self._exhausted = False
+        self._mmap = None
+
+        os.makedirs(self.path, exist_ok=True)
+        with self._locked():
+            if not os.path.exists(self.filename):
+                self._replace(_pack(self._generate()))
+            self._open()
+
+    def _generate(self):
+        return generate_names(ancestry=self.ancestry, count=self.size, workers=self.workers)
+
+    @contextmanager
+    def _locked(self):
+        """
+        Hold an exclusive lock on the bank file, shared with other processes.
+        """
+        if fcntl is None:
+            yield
+            return
+        with open(f'{self.filename}.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _open(self):
+        """
+        Memory-map the bank file and create views of the bitmap and offsets.
+        """
+        with open(self.filename, 'r+b') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0)
+            self._inode = os.fstat(f.fileno()).st_ino
+
+        magic = self._mmap[:4]
+        if magic == _magic_v1:
+            self._map_views(_header_v1.unpack_from(self._mmap)[1], _header_v1.size)
+            self._upgrade()
+            return
+        if magic != _magic:
+            raise NameBankError(f"{self.filename} is not a name bank.")
+        self._map_views(_header.unpack_from(self._mmap)[1], _header.size)
+
+    def _map_views(self, count, header_size):
+        self._count = count
+        bitmap_start = header_size
+        offsets_start = bitmap_start + ((count + 31) // 32) * 4
+        self._blob_start = offsets_start + (count + 1) * 4
+        self._bitmap = memoryview(self._mmap)[bitmap_start:offsets_start]
+        self._offsets = memoryview(self._mmap)[offsets_start:self._blob_start].cast('I')
+
+    def _upgrade(self):
+        """
+        Rewrite a bank in the first layout, counting its used names once.
+        """
+        names = [self._name(i) for i in range(self._count)]
+        used = [name for (i, name) in enumerate(names) if self._is_used(i)]
+        self._close()
+        self._replace(_pack(names, used))
+        self._open()
+
+    @property
+    def _used(self):
+        """
+        The number of used names, kept in the header of the mapped file so that every process sees the same count.
+        """
+        return _used_field.unpack_from(self._mmap, _used_offset)[0]
+
+    @_used.setter
+    def _used(self, value):
+        _used_field.pack_into(self._mmap, _used_offset, value)
+
+    def _sync(self):
+        """
+        Remap the bank file if another process has replaced it. Call with the lock held.
+        """
+        if os.stat(self.filename).st_ino != self._inode:
+            self._close()
+            self._open()
+
+    def _close(self):
+        if self._mmap:
+            self._bitmap.release()
+            self._offsets.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def _replace(self, data):
+        """
+        Atomically replace the bank file with new contents.
+        """
+        tmp = f'{self.filename}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.filename)
+
+    def _name(self, index):
+        start = self._blob_start + self._offsets[index]
+        end = self._blob_start + self._offsets[index + 1]
+        return self._mmap[start:end].decode('utf-8')
+
+    def _is_used(self, index):
+        return self._bitmap[index >> 3] & (1 << (index & 7))
+
+    def _take(self):
+        """
+        Choose a random unused name and mark it as used. Call with the lock held, after _sync().
+        """
+        while True:
+            index = self._random.randrange(self._count)
+            if not self._is_used(index):
+                break
+        self._bitmap[index >> 3] |= 1 << (index & 7)
+        self._used += 1
+        return self._name(index)
+
+    def _refill(self):
+        """
+        Merge a fresh batch of generated names into the bank.
+        """
+        new_names = list(self._generate())
+        with self._lock, self._locked():
+            self._sync()
+            names = [self._name(i) for i in range(self._count)]
+            used = [name for (i, name) in enumerate(names) if self._is_used(i)]
+            previous_count = self._count
+            self._close()
+            self._replace(_pack(names + new_names, used))
+            self._open()
+            if self._count == previous_count:
+                self._exhausted = True
+
+    def _refill_async(self):
+        """
+        Start a background refill unless one is already running. Returns the refill thread.
+        """
+        if not (self._refill_thread and self._refill_thread.is_alive()):
+            self._refill_thread = threading.Thread(target=self._refill, daemon=True)
+            self._refill_thread.start()
+        return self._refill_thread
+
+    @property
+    def remaining(self):
+        """
+        The number of unused names in the bank.
+        """
+        with self._lock, self._locked():
+            self._sync()
+            return self._count - self._used
+
+    def get(self):
+        """
+        Return a name that has never been served by this bank before.
+
+        Raises:
+            NameBankError: If every name is used and refilling the bank produced no new names
+        """
+        while True:
+            with self._lock, self._locked():
+                self._sync()
+                if self._used < self._count:
+                    name = self._take()
+                    if not self._exhausted and self._used >= self._count * self.low_water:
+                        self._refill_async()
+                    return name
+                if self._exhausted:
+                    raise NameBankError(f"The {self.language} name bank has no unused names left.")
+                thread = self._refill_async()
+            thread.join()
+
+    def __contains__(self, name):
+        with self._lock, self._locked():
+            self._sync()
+            lo = 0
+            hi = self._count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._name(mid) < name:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return lo < self._count and self._name(lo) == name
+
+    def __len__(self):
+        with self._lock, self._locked():
+            self._sync()
+            return self._count
+
+
+def get_bank(ancestry, **kwargs):
+    """
+    Return the process-wide NameBank for the specified ancestry, creating it if necessary.
+    """
+    if ancestry not in _banks:
+        _banks[ancestry] = NameBank(ancestry, **kwargs)
+    return _banks[ancestry]
+
+
+def unique_names(ancestry=None, count=1):
+    """
+    Yield count names that have never been served before, of the specified ancestry or of random ancestries.
+    """
+    for _ in range(count):
+        npc = npc_type(ancestry)
+        yield get_bank(npc.__module__.rsplit('.', 1)[-1]).get()
@@ -1,11 +1,11 @@
-from telisar.languages import infernal
+from telisar.languages import infernal, get_language
 from telisar.npc.base import BaseNPC
 import random
 
 
 class NPC(BaseNPC):
     ancestry = 'Tiefling'
-    language = infernal.Tiefling()
+    language = get_language(infernal.Tiefling)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -29,11 +29,11 @@ class NPC(BaseNPC):
             ])
         return self._skin_color
 
-    @property
-    def full_name(self):
-        name = ' '.join([n.capitalize() for n in self.names])
-        if self.title:
-            name = self.title.capitalize() + ' ' + name
-        if self.nickname:
-            name = name + ' ' + self.nickname.capitalize()
+    @classmethod
+    def compose_name(cls, names, title=None, nickname=None):
+        name = ' '.join([str(n).capitalize() for n in names])
+        if title:
+            name = title.capitalize() + ' ' + name
+        if nickname:
+            name = name + ' ' + nickname.capitalize()
         return name
@@ -2,6 +2,57 @@
 A Telisaran calendaring tool.
 """
 from . import telisaran
+from bisect import bisect_left
+from functools import lru_cache
+import html
+
+
+formats = ['text', 'markdown', 'html']
+
+
+@lru_cache(maxsize=None)
+def _layout(format, length):
+    """
+    Return the grid of a season of the specified length in days, as a format string with one placeholder per day,
+    and the rendered grid with no events marked. Every standard season shares one layout, and the Festival Of The
+    Hunt another, so each is built only once per format.
+    """
+    days = telisaran.Span.length_in_days
+    header = [n[0:2] for n in telisaran.Day.names]
+    if format == 'text':
+        rows = [''.join(' ' + name for name in header)]
+        rows += [''.join('{%d}' % (day + i) for i in range(days)) for day in range(0, length, days)]
+        plain = [' {:02d}'.format(day) for day in range(1, length + 1)]
+        template = '\n'.join(rows)
+    elif format == 'markdown':
+        rows = ['| ' + ' | '.join(header) + ' |', '|' + '----|' * days]
+        rows += ['| ' + ' | '.join('{%d}' % (day + i) for i in range(days)) + ' |' for day in range(0, length, days)]
+        plain = ['{:02d}'.format(day) for day in range(1, length + 1)]
+        template = '\n'.join(rows)
+    elif format == 'html':
+        rows = ['<tr>' + ''.join(f'<th>{name}</th>' for name in header) + '</tr>']
+        rows += ['<tr>' + ''.join('{%d}' % (day + i) for i in range(days)) + '</tr>' for day in range(0, length, days)]
+        plain = ['<td>{:02d}</td>'.format(day) for day in range(1, length + 1)]
+        template = '\n'.join(rows)
+    else:
+        raise ValueError("Unknown calendar format '{}'; must be one of {}".format(format, ', '.join(formats)))
+    return (template, template.format(*plain), plain)
+
+
+def _marked(format, day, descriptions):
+    if format == 'text':
+        return '*{:02d}'.format(day)
+    elif format == 'markdown':
+        return '**{:02d}**'.format(day)
+    return '<td class="event" title="{}">{:02d}</td>'.format(html.escape('; '.join(descriptions)), day)
+
+
+def _season_title(season, year, era):
+    if season == telisaran.Year.length_in_seasons + 1:
+        name = 'The Festival Of The Hunt'
+    else:
+        name = 'Season of the {}'.format(telisaran.Season.names[season - 1])
+    return '{}, {} {}'.format(name, year, telisaran.Era.short_names[era - 1])
 
 
 class Calendar:
@@ -19,7 +70,14 @@ class Calendar:
 
     """
 
-    def __init__(self, today=None, start=None, end=None):
+    def __init__(self, today=None, start=None, end=None, events=None):
+        """
+        Args:
+            today (datetime): optional, the current date; defaults to telisaran.today
+            start (datetime): optional, the start of the calendar; defaults to the start of the current season
+            end (datetime): optional, the end of the calendar; defaults to today
+            events (dict): optional, datetimes or campaign Events keyed by description, to mark on the calendar
+        """
 
         self.today = today
         if not self.today:
@@ -31,26 +89,132 @@ class Calendar:
             self._start = start
         else:
             self._start = telisaran.datetime(
+                era=self._end.era.era,
                 year=self._end.year.year,
                 season=self._end.season.season_of_year,
                 day=1
             )
 
+        self.events = events or {}
+
+    def _index_events(self):
+        """
+        Return a sorted list of the days on which events fall and a dictionary of event descriptions by day.
+        Redacted events are marked but not described.
+        """
+        by_day = {}
+        for (description, event) in self.events.items():
+            if getattr(event, 'redacted', False):
+                description = 'REDACTED'
+            day = int(getattr(event, 'timestamp', event)) // telisaran.Day.length_in_seconds
+            by_day.setdefault(day, []).append(description)
+        return (sorted(by_day), by_day)
+
+    def _seasons(self, start, end):
+        """
+        Yield the start and length in days of every season overlapping the range from start to end, in seconds.
+        """
+        festival = telisaran.Year.length_in_seasons * telisaran.Season.length_in_seconds
+        offsets = [i * telisaran.Season.length_in_seconds for i in range(telisaran.Year.length_in_seasons)]
+        offsets.append(festival)
+
+        (year_start, offset) = divmod(start, telisaran.Year.length_in_seconds)
+        year_start *= telisaran.Year.length_in_seconds
+        index = offset // telisaran.Season.length_in_seconds
+        while year_start + offsets[index] < end:
+            length = (telisaran.FestivalOfTheHunt if offsets[index] == festival else telisaran.Season).length_in_days
+            yield (year_start + offsets[index], length)
+            index += 1
+            if index == len(offsets):
+                index = 0
+                year_start += telisaran.Year.length_in_seconds
+
+    def render_seasons(self, start=None, end=None, format='text'):
+        """
+        Yield the rendered calendar of each season overlapping the range from start to end, with any events marked.
+
+        Args:
+            start (datetime or int): optional, the start of the range; defaults to the calendar's start
+            end (datetime or int): optional, the end of the range; defaults to the calendar's end
+            format (str): One of 'text', 'markdown' or 'html'
+
+        Returns:
+            generator: A generator yielding each season as a string
+        """
+        start = int(self._start if start is None else start)
+        end = int(self._end if end is None else end)
+        end = max(end, start + 1)
+        (event_days, by_day) = self._index_events()
+
+        for (season_start, length) in self._seasons(start, end):
+            (template, plain_grid, plain) = _layout(format, length)
+            (era, year, season) = telisaran.datetime.from_seconds(season_start).parts[0:3]
+            title = _season_title(season, year, era)
+
+            first_day = season_start // telisaran.Day.length_in_seconds
+            marked = event_days[bisect_left(event_days, first_day):bisect_left(event_days, first_day + length)]
+            if marked:
+                cells = list(plain)
+                for day in marked:
+                    cells[day - first_day] = _marked(format, day - first_day + 1, by_day[day])
+                grid = template.format(*cells)
+            else:
+                grid = plain_grid
+
+            if format == 'text':
+                legend = ''.join(
+                    '\n{:02d}: {}'.format(day - first_day + 1, description)
+                    for day in marked for description in by_day[day]
+                )
+                yield '{}\n{}{}\n'.format(title, grid, legend)
+            elif format == 'markdown':
+                legend = ''.join(
+                    '\n- **{:02d}**: {}'.format(day - first_day + 1, description)
+                    for day in marked for description in by_day[day]
+                )
+                yield '### {}\n\n{}\n{}\n'.format(title, grid, legend)
+            else:
+                yield '<table class="season">\n<caption>{}</caption>\n{}\n</table>\n'.format(html.escape(title), grid)
+
+    def render(self, start=None, end=None, format='text'):
+        """
+        Render the calendar of every season overlapping the range from start to end.
+
+        Args:
+            start (datetime or int): optional, the start of the range; defaults to the calendar's start
+            end (datetime or int): optional, the end of the range; defaults to the calendar's end
+            format (str): One of 'text', 'markdown' or 'html'
+
+        Returns:
+            str: The rendered calendar
+        """
+        return '\n'.join(self.render_seasons(start=start, end=end, format=format))
+
+    def year(self, year=None, era=None, format='text'):
+        """
+        Render the calendar of a whole year, by default the current one.
+        """
+        return self.years(start=year, end=year, era=era, format=format)
+
+    def years(self, start=None, end=None, era=None, format='text'):
+        """
+        Render the calendar of a slice of an era, from the start year through the end year, inclusive. The start
+        year defaults to the current year, and the end year to the start year.
+        """
+        era = era or self.today.era.era
+        start = start or self.today.year.year
+        end = end or start
+        first = telisaran.datetime(era=era, year=start)
+        return self.render(first, int(first) + (end - start + 1) * telisaran.Year.length_in_seconds, format=format)
+
     def season(self):
-        print(self._start.season.name.upper().center(14))
-        print(" ".join([n[0:2] for n in telisaran.Day.names]))
-        chunks = []
-        for day in self._start.season.days:
-            chunks.append("{:02d}".format(day.day_of_season))
-            if day.day_of_span == telisaran.Span.length_in_days:
-                print(" ".join(chunks))
-                chunks = []
+        print(self.render(self._start, self._start))
 
     @property
     def yesterday(self):
         try:
             return self.today - telisaran.Day.length_in_seconds
-        except telisaran.InvalidDayError:
+        except telisaran.InvalidDateError:
             return "Mortals cannot go back before the beginning of time."
 
     @property
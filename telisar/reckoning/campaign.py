@@ -2,43 +2,272 @@
 The Campaign clock for the Noobhammer Chronicles
 """
 from telisar.reckoning import telisaran
+from telisar.reckoning.calendar import Calendar
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
 import collections
+import collections.abc
+import itertools
 import json
+import os
+import sqlite3
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
 
 
 event_properties = ['timestamp', 'redacted']
 Event = collections.namedtuple('Event', event_properties)
 
+# timeline versions are unique across instances, so cached dates from one timeline never match another
+_versions = itertools.count(1)
+
+
+def _markdown(events):
+    """
+    Yield the lines of a markdown table of (description, Event) pairs, in the order given.
+    """
+    yield "|= Date |= Event"
+    for (description, event) in events:
+        if event.redacted:
+            description = 'REDACTED'
+        yield f'| *{event.timestamp.numeric_date}* | {description}\n'
+
+
+class _LazyEvents(collections.abc.MutableMapping):
+    """
+    A dictionary of Events keyed by description that holds events as they are stored, [seconds, redacted], and
+    creates each Event only when it is first retrieved.
+    """
+
+    def __init__(self, raw=None):
+        self._raw = raw or {}
+
+    def __getitem__(self, description):
+        event = self._raw[description]
+        if not isinstance(event, Event):
+            event = Event(timestamp=telisaran.datetime.from_seconds(event[0]), redacted=event[1])
+            self._raw[description] = event
+        return event
+
+    def __setitem__(self, description, event):
+        self._raw[description] = event
+
+    def __delitem__(self, description):
+        del self._raw[description]
+
+    def __contains__(self, description):
+        return description in self._raw
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __len__(self):
+        return len(self._raw)
+
+    def seconds(self, description):
+        """
+        Return the timestamp of an event as integer seconds, without creating the Event.
+        """
+        event = self._raw[description]
+        return int(event.timestamp) if isinstance(event, Event) else event[0]
+
+    def as_raw(self):
+        """
+        Return a dictionary of the events as they are stored, [seconds, redacted], keyed by description.
+        """
+        return dict(
+            (description, [int(event.timestamp), event.redacted] if isinstance(event, Event) else event)
+            for (description, event) in self._raw.items()
+        )
+
 
 class Timeline:
     """
     Manage the events of a campaign timeline.
+
+    Events are kept as they are stored, in integer seconds, and each datetime is created the first time its event is
+    retrieved. The timeline also keeps an index of integer timestamps and descriptions in date order, which is
+    built the first time it is needed, updated incrementally as events are added and removed, and searched by
+    bisection. Commands that only need today's date, such as forward, never build either.
+
+    Changes are not written by rewriting the datafile. Each change is appended as one JSON record to a journal next
+    to it (<datafile>.journal): {"op": "add" | "del" | "today", ...}. Loading reads the datafile as a snapshot and
+    replays the journal over it. Once the journal holds compact_after records, the events are written to a new
+    snapshot, which atomically replaces the datafile, and the journal is started afresh.
+
+    Writers hold an exclusive lock on <datafile>.lock and replay any records appended by other processes before
+    appending their own, so concurrent writers never overwrite each other's changes.
+
+    Class Attributes:
+        compact_after (int): The number of journal records that triggers compaction
+
+    Attributes:
+        version (int): Changes whenever the events change; used to key the date parser's cache
     """
 
+    compact_after = 1000
+
     def __init__(self, datafile=None):
         self._datafile = datafile
+        self._journal = f'{datafile}.journal' if datafile else None
         self._load()
 
+    @contextmanager
+    def _locked(self):
+        """
+        Hold an exclusive lock on the timeline's files.
+        """
+        if not self._datafile or fcntl is None:
+            yield
+            return
+        with open(f'{self._datafile}.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _journaled(self):
+        """
+        Hold the lock and bring the events up to date with the journal, so changes can be committed.
+        """
+        with self._locked():
+            self._replay()
+            yield
+
     def _load(self):
         """
-        Load events from a JSON file.
+        Load events from the snapshot and the journal.
         """
-        self._events = dict()
-        if self._datafile:
+        with self._locked():
+            self._read_snapshot()
+            self._replay()
+
+    def _read_snapshot(self):
+        """
+        Load events from the JSON snapshot.
+        """
+        self._events = _LazyEvents()
+        self.version = next(_versions)
+        self._journal_inode = None
+        self._journal_position = 0
+        self._journal_records = 0
+        self._sorted_timestamps = None
+        self._sorted_descriptions = None
+        if self._datafile and os.path.exists(self._datafile):
             with open(self._datafile, 'r') as f:
-                self._events = json.load(f)
+                self._events = _LazyEvents(json.load(f))
 
-            for (event, attrs) in self._events.items():
-                attrs[0] = telisaran.datetime.from_seconds(attrs[0])
-                self._events[event] = Event(**dict(zip(event_properties, attrs)))
+    def _build_index(self):
+        if self._sorted_timestamps is None:
+            index = sorted((self._events.seconds(description), description) for description in self._events)
+            self._sorted_timestamps = [timestamp for (timestamp, _) in index]
+            self._sorted_descriptions = [description for (_, description) in index]
 
-    def _write(self):
+    @property
+    def _timestamps(self):
         """
-        Write timeline events to a JSON file.
+        The timestamps of the events, in date order.
         """
-        if self._datafile:
-            with open(self._datafile, 'w') as f:
-                f.write(self.as_json)
+        self._build_index()
+        return self._sorted_timestamps
+
+    @property
+    def _descriptions(self):
+        """
+        The descriptions of the events, in date order.
+        """
+        self._build_index()
+        return self._sorted_descriptions
+
+    def _replay(self):
+        """
+        Apply any journal records that have not been applied yet. If another process has compacted the journal since
+        it was last read, the snapshot is reloaded first. An incomplete last record, left by a crashed writer, is
+        ignored.
+        """
+        if not self._journal:
+            return
+        # create the journal if need be, so that its replacement by another process can always be detected
+        with open(self._journal, 'a+b') as f:
+            stat = os.fstat(f.fileno())
+            if self._journal_inode not in (None, stat.st_ino) or stat.st_size < self._journal_position:
+                self._read_snapshot()
+            self._journal_inode = stat.st_ino
+            f.seek(self._journal_position)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                self._apply(json.loads(line), replay=True)
+                self._journal_position += len(line)
+                self._journal_records += 1
+
+    def _apply(self, record, replay=False):
+        """
+        Apply a journal record to the events. When replaying, deleting an event that does not exist is ignored.
+        """
+        if record['op'] == 'del':
+            if not replay or record['description'].title() in self._events:
+                self._del(record['description'])
+        else:
+            description = 'Today' if record['op'] == 'today' else record['description']
+            date = telisaran.datetime.from_seconds(record['timestamp'])
+            self._add(description, date, redacted=record.get('redacted', False))
+
+    def _commit(self, record):
+        """
+        Apply a record and append it to the journal. Callers must hold the lock, by way of _journaled().
+        """
+        self._apply(record)
+        if not self._journal:
+            return
+        with open(self._journal, 'ab') as f:
+            # drop an incomplete record left by a crashed writer
+            if f.tell() > self._journal_position:
+                f.truncate(self._journal_position)
+            line = (json.dumps(record) + '\n').encode('utf-8')
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            self._journal_inode = os.fstat(f.fileno()).st_ino
+        self._journal_position += len(line)
+        self._journal_records += 1
+        if self._journal_records >= self.compact_after:
+            self._compact()
+
+    def _replace(self, path, data):
+        """
+        Atomically replace a file with new contents.
+        """
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _compact(self):
+        """
+        Write the events to a new snapshot and start a new journal. Callers must hold the lock. The old journal's
+        records are all reflected in the new snapshot, and replaying them over it would be harmless, so a crash
+        between the two replacements loses nothing.
+        """
+        self._replace(self._datafile, self.as_json)
+        self._replace(self._journal, '')
+        self._journal_inode = os.stat(self._journal).st_ino
+        self._journal_position = 0
+        self._journal_records = 0
+
+    def _index(self, description, timestamp):
+        """
+        Return the position of an event in the index.
+        """
+        position = bisect_left(self._timestamps, timestamp)
+        return position + self._descriptions[position:bisect_right(self._timestamps, timestamp)].index(description)
 
     def _add(self, description, date, redacted=False):
         """
@@ -49,7 +278,14 @@ class Timeline:
             date (datetime): The datetime associated with the event
             redacted (boolean): If True, do not include it in the public timeline
         """
+        if description.title() in self._events:
+            self._del(description)
         self._events[description.title()] = Event(timestamp=date, redacted=redacted)
+        if self._sorted_timestamps is not None:
+            position = bisect_right(self._sorted_timestamps, int(date))
+            self._sorted_timestamps.insert(position, int(date))
+            self._sorted_descriptions.insert(position, description.title())
+        self.version = next(_versions)
         return self._events.get(description)
 
     def _del(self, description):
@@ -59,7 +295,72 @@ class Timeline:
         Args:
             description (str): The text of the event
         """
+        timestamp = self._events.seconds(description.title())
         del self._events[description.title()]
+        if self._sorted_timestamps is not None:
+            position = self._index(description.title(), timestamp)
+            del self._sorted_timestamps[position]
+            del self._sorted_descriptions[position]
+        self.version = next(_versions)
+
+    def _resolve(self, date):
+        """
+        Convert a datetime, integer seconds or date expression to integer seconds.
+        """
+        if isinstance(date, str):
+            date = telisaran.datetime.from_expression(date, timeline=self._events, version=self.version)
+        return int(date)
+
+    def between(self, start, end):
+        """
+        Return the events from start up to, but not including, end, in date order.
+
+        Args:
+            start (datetime, int or str): The start of the range, as a date, seconds or an expression
+            end (datetime, int or str): The end of the range, as a date, seconds or an expression
+
+        Returns:
+            list: (description, Event) tuples
+        """
+        first = bisect_left(self._timestamps, self._resolve(start))
+        last = bisect_left(self._timestamps, self._resolve(end))
+        return [(description, self._events[description]) for description in self._descriptions[first:last]]
+
+    def before(self, date):
+        """
+        Return the latest event strictly before the specified date, or None.
+
+        Args:
+            date (datetime, int or str): The date, as a date, seconds or an expression
+
+        Returns:
+            tuple: The (description, Event) of the nearest earlier event
+        """
+        position = bisect_left(self._timestamps, self._resolve(date))
+        if not position:
+            return None
+        description = self._descriptions[position - 1]
+        return (description, self._events[description])
+
+    def redacted(self):
+        """
+        Return the redacted events, in date order, as (description, Event) tuples.
+        """
+        return [
+            (description, self._events[description]) for description in self._descriptions
+            if self._events[description].redacted
+        ]
+
+    def search(self, text):
+        """
+        Return the events whose descriptions contain every word of the text, in date order, as (description, Event)
+        tuples.
+        """
+        words = text.lower().split()
+        return [
+            (description, self._events[description]) for description in self._descriptions
+            if all(word in description.lower() for word in words)
+        ]
 
     # CLI entry-points
 
@@ -77,8 +378,8 @@ class Timeline:
 
         DESCRIPTION   The description of the event
         """
-        self._del(description)
-        self._write()
+        with self._journaled():
+            self._commit({'op': 'del', 'description': description})
         return repr(self)
 
     def record(self, description, expression, redacted=False):
@@ -100,8 +401,20 @@ class Timeline:
         REDACTED      If True, do not include this event in the public timeline.
 
         """
-        self._add(description, telisaran.datetime.from_expression(expression, timeline=self._events), redacted=redacted)
-        self._write()
+        with self._journaled():
+            date = telisaran.datetime.from_expression(expression, timeline=self._events, version=self.version)
+            self._commit({'op': 'add', 'description': description, 'timestamp': int(date), 'redacted': redacted})
+        return repr(self)
+
+    def compact(self):
+        """compact
+
+        Description:
+            Fold the journal of changes into a new snapshot of the timeline.
+        """
+        if self._datafile:
+            with self._journaled():
+                self._compact()
         return repr(self)
 
     @property
@@ -117,10 +430,7 @@ class Timeline:
 
     @property
     def as_json(self):
-        def serializer(obj):
-            if isinstance(obj, telisaran.datetime):
-                return int(obj)
-        return json.dumps(self._events, default=serializer)
+        return json.dumps(self._events.as_raw())
 
     @property
     def as_markdown(self):
@@ -129,26 +439,265 @@ class Timeline:
         Description:
             Dump the timeline of events as a markdown-formatted list.
         """
-        yield("|= Date |= Event")
-        for (description, event) in sorted(self._events.items(), key=lambda e: e[1].timestamp):
-            if event.redacted:
-                description = 'REDACTED'
-            yield(f'| *{event.timestamp.numeric_date}* | {description}\n')
+        return _markdown((description, self._events[description]) for description in self._descriptions)
 
     @property
     def today(self):
         return self._events['Today'].timestamp
 
+    def calendar(self, start=None, end=None, format='text'):
+        """calendar
+
+        Description:
+            Render a calendar of the seasons from start to end, with the timeline's events marked.
+
+        Examples:
+
+            calendar
+            calendar "on 3.3206.1.1" "2 years after 3.3206.1.1" --format=markdown
+
+        Parameters:
+
+        START   optional, an expression for the start of the calendar; defaults to the start of the current season
+        END     optional, an expression for the end of the calendar; defaults to today
+        FORMAT  One of text, markdown or html
+        """
+        dates = [
+            telisaran.datetime.from_expression(expression, timeline=self._events, version=self.version)
+            if expression else None
+            for expression in (start, end)
+        ]
+        today = self.today if 'Today' in self._events else None
+        return Calendar(today=today, events=self._events).render(*dates, format=format)
+
     def forward(self, days=1):
         """forward
 
         Description:
             Move the current date forward one day.
         """
-        new_date = self.today + (days * telisaran.Day.length_in_seconds)
-        self._add('Today', new_date, redacted=False)
-        self._write()
+        with self._journaled():
+            new_date = self.today + (days * telisaran.Day.length_in_seconds)
+            self._commit({'op': 'today', 'timestamp': int(new_date)})
         return new_date
 
     def __str__(self):
         return self.list
+
+
+class _Events(collections.abc.Mapping):
+    """
+    A read-only mapping of description to Event over one campaign's events in a SQLite database, in date order.
+    """
+
+    def __init__(self, timeline):
+        self._timeline = timeline
+
+    def __getitem__(self, description):
+        row = self._timeline._query(
+            'SELECT timestamp, redacted FROM events WHERE campaign = ? AND description = ?', description).fetchone()
+        if row is None:
+            raise KeyError(description)
+        return Event(timestamp=telisaran.datetime.from_seconds(row[0]), redacted=bool(row[1]))
+
+    def __iter__(self):
+        for (description, ) in self._timeline._query(
+                'SELECT description FROM events WHERE campaign = ? ORDER BY timestamp, description'):
+            yield description
+
+    def __len__(self):
+        return self._timeline._query('SELECT COUNT(*) FROM events WHERE campaign = ?').fetchone()[0]
+
+
+class SQLiteTimeline(Timeline):
+    """
+    A campaign timeline stored in a SQLite database, with the same interface as Timeline. One database can hold the
+    timelines of many campaigns. Events are indexed by campaign and timestamp for range queries, and their
+    descriptions are indexed for full-text search when SQLite has the FTS5 extension.
+
+    Attributes:
+        campaign (str): The name of the campaign
+        version (tuple): Changes whenever the events change, in this process or another
+    """
+
+    schema = [
+        """
+        CREATE TABLE IF NOT EXISTS events (
+            campaign TEXT NOT NULL,
+            description TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            redacted INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (campaign, description)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS events_by_timestamp ON events (campaign, timestamp)",
+    ]
+
+    fts_schema = [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS events_fts
+            USING fts5(description, content='events', content_rowid='rowid')
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
+            INSERT INTO events_fts (rowid, description) VALUES (new.rowid, new.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
+            INSERT INTO events_fts (events_fts, rowid, description) VALUES ('delete', old.rowid, old.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS events_fts_update AFTER UPDATE ON events BEGIN
+            INSERT INTO events_fts (events_fts, rowid, description) VALUES ('delete', old.rowid, old.description);
+            INSERT INTO events_fts (rowid, description) VALUES (new.rowid, new.description);
+        END
+        """,
+    ]
+
+    def __init__(self, database, campaign='default'):
+        """
+        Args:
+            database (str): The path to the SQLite database, which is created if it does not exist
+            campaign (str): The name of the campaign whose timeline this is
+        """
+        self._database = database
+        self.campaign = campaign
+        self._token = next(_versions)
+        self._changes = 0
+        super().__init__()
+
+    def _load(self):
+        self._db = sqlite3.connect(self._database, isolation_level=None)
+        for statement in self.schema:
+            self._db.execute(statement)
+        try:
+            for statement in self.fts_schema:
+                self._db.execute(statement)
+            self._fts = True
+        except sqlite3.OperationalError:  # pragma: no cover
+            self._fts = False
+        self._events = _Events(self)
+
+    def _query(self, sql, *params):
+        """
+        Execute a query with the campaign as its first parameter.
+        """
+        return self._db.execute(sql, (self.campaign, ) + params)
+
+    def _rows(self, cursor):
+        return [
+            (description, Event(timestamp=telisaran.datetime.from_seconds(timestamp), redacted=bool(redacted)))
+            for (description, timestamp, redacted) in cursor
+        ]
+
+    @property
+    def version(self):
+        return (self._token, self._changes, self._db.execute('PRAGMA data_version').fetchone()[0])
+
+    @contextmanager
+    def _journaled(self):
+        """
+        Run the enclosed changes in a single write transaction.
+        """
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        self._db.execute('COMMIT')
+
+    def _commit(self, record):
+        self._apply(record)
+
+    def _add(self, description, date, redacted=False):
+        self._query(
+            'INSERT INTO events (campaign, description, timestamp, redacted) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (campaign, description) DO UPDATE SET timestamp = excluded.timestamp, '
+            'redacted = excluded.redacted',
+            description.title(), int(date), bool(redacted)
+        )
+        self._changes += 1
+
+    def _del(self, description):
+        if not self._query(
+                'DELETE FROM events WHERE campaign = ? AND description = ?', description.title()).rowcount:
+            raise KeyError(description.title())
+        self._changes += 1
+
+    def between(self, start, end):
+        return self._rows(self._query(
+            'SELECT description, timestamp, redacted FROM events '
+            'WHERE campaign = ? AND timestamp >= ? AND timestamp < ? ORDER BY timestamp, description',
+            self._resolve(start), self._resolve(end)
+        ))
+
+    def before(self, date):
+        rows = self._rows(self._query(
+            'SELECT description, timestamp, redacted FROM events '
+            'WHERE campaign = ? AND timestamp < ? ORDER BY timestamp DESC, description DESC LIMIT 1',
+            self._resolve(date)
+        ))
+        return rows[0] if rows else None
+
+    def redacted(self):
+        return self._rows(self._query(
+            'SELECT description, timestamp, redacted FROM events '
+            'WHERE campaign = ? AND redacted ORDER BY timestamp, description'
+        ))
+
+    def search(self, text):
+        if not self._fts:  # pragma: no cover
+            return super().search(text)
+        terms = ' '.join('"{}"'.format(word.replace('"', '""')) for word in text.split())
+        return self._rows(self._query(
+            'SELECT events.description, events.timestamp, events.redacted FROM events_fts '
+            'JOIN events ON events.rowid = events_fts.rowid '
+            'WHERE events.campaign = ? AND events_fts MATCH ? ORDER BY events.timestamp, events.description',
+            terms
+        ))
+
+    def campaigns(self):
+        """campaigns
+
+        Description:
+            List the campaigns in the database.
+        """
+        return [campaign for (campaign, ) in self._db.execute('SELECT DISTINCT campaign FROM events ORDER BY 1')]
+
+    def import_timeline(self, datafile):
+        """import-timeline
+
+        Description:
+            Copy the events of a JSON timeline into this campaign.
+
+        Parameters:
+
+        DATAFILE   The path to the JSON timeline
+        """
+        with self._journaled():
+            for (description, event) in Timeline(datafile)._events.items():
+                self._add(description, event.timestamp, redacted=event.redacted)
+        return repr(self)
+
+    def compact(self):
+        """compact
+
+        Description:
+            Rebuild the database file to reclaim unused space.
+        """
+        self._db.execute('VACUUM')
+        return repr(self)
+
+    @property
+    def as_json(self):
+        return json.dumps(dict(
+            (description, [int(event.timestamp), event.redacted]) for (description, event) in self._events.items()
+        ))
+
+    @property
+    def as_markdown(self):
+        return _markdown(self._rows(self._query(
+            'SELECT description, timestamp, redacted FROM events WHERE campaign = ? ORDER BY timestamp, description')))
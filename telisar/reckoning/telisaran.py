@@ -2,10 +2,18 @@
 Primitives for the Telisaran reckoning of dates and time.
 """
 from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import OrderedDict
+from functools import lru_cache
 import inspect
 import sys
 import re
 
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
 
 class ReckoningError(Exception):
     pass
@@ -81,6 +89,7 @@ class DateObject(ABC):  # pragma: no cover
         as_seconds (int): The component object expressed as seconds since the beginning of time.
         length_in_seconds (int): The number of seconds in a single object.
     """
+    __slots__ = ()
 
     @property
     @abstractmethod
@@ -143,6 +152,9 @@ class datetime(DateObject):
     """
     A date and time on the Telisaran calendar.
 
+    A datetime stores only the number of seconds since the beginning of time; its components are
+    computed, and their objects created, the first time they are accessed.
+
     Attributes:
         era (Era): The era component of the date
         year (Year): The year component of the date
@@ -161,7 +173,9 @@ class datetime(DateObject):
         time (str): Alias of time_short
         as_seconds (int): The date and time expressed in seconds since the beginning of time
         number (int): alias for as_seconds
+        parts (tuple): The integer (era, year, season, day, hour, minute, second) components
     """
+    __slots__ = ('_seconds', '_parts', '_era', '_year', '_season', '_day', '_hour', '_minute')
 
     def __init__(self, era=1, year=1, season=1, day=1, hour=0, minute=0, second=0):
         """
@@ -171,19 +185,84 @@ class datetime(DateObject):
             day (int): The day, 1-45
             era (int): The era, 1-3
         """
-        self.era = Era(era)
-        self.year = Year(year, era=self.era)
-        if season == Year.length_in_seasons + 1:
-            self.season = FestivalOfTheHunt(year)
-        else:
-            self.season = Season(season_of_year=season, year=self.year.year)
-        self.day = Day(day, season=self.season)
-        self.hour = Hour(hour)
-        self.minute = Minute(minute)
-
+        Era.validate(era)
+        Year.validate(year, era)
+        if season != Year.length_in_seasons + 1:
+            Season.validate(season)
+        Day.validate(day)
+        Hour.validate(hour)
+        Minute.validate(minute)
         if second < 0 or second > 59:
             raise InvalidSecondError("second {} must be between 0 and 59".format(second))
-        self.second = second
+
+        self._reset(
+            (sum(Era.years[:era - 1]) + year - 1) * Year.length_in_seconds +
+            (season - 1) * Season.length_in_seconds +
+            (day - 1) * Day.length_in_seconds +
+            hour * Hour.length_in_seconds +
+            minute * Minute.length_in_seconds +
+            second,
+            parts=(era, year, season, day, hour, minute, second)
+        )
+
+    def _reset(self, seconds, parts=None):
+        self._seconds = seconds
+        self._parts = parts
+        self._era = None
+        self._year = None
+        self._season = None
+        self._day = None
+        self._hour = None
+        self._minute = None
+
+    @property
+    def parts(self):
+        if self._parts is None:
+            self._parts = _decompose(self._seconds)
+        return self._parts
+
+    @property
+    def era(self):
+        if self._era is None:
+            self._era = Era(self.parts[0])
+        return self._era
+
+    @property
+    def year(self):
+        if self._year is None:
+            self._year = Year(self.parts[1], era=self.era)
+        return self._year
+
+    @property
+    def season(self):
+        if self._season is None:
+            if self.parts[2] == Year.length_in_seasons + 1:
+                self._season = FestivalOfTheHunt(self.parts[1])
+            else:
+                self._season = Season(season_of_year=self.parts[2], year=self.parts[1])
+        return self._season
+
+    @property
+    def day(self):
+        if self._day is None:
+            self._day = Day(self.parts[3], season=self.season)
+        return self._day
+
+    @property
+    def hour(self):
+        if self._hour is None:
+            self._hour = Hour(self.parts[4])
+        return self._hour
+
+    @property
+    def minute(self):
+        if self._minute is None:
+            self._minute = Minute(self.parts[5])
+        return self._minute
+
+    @property
+    def second(self):
+        return self.parts[6]
 
     @property
     def long(self):
@@ -272,11 +351,17 @@ class datetime(DateObject):
 
     @property
     def as_seconds(self):
-        return sum(map(int, [self.era, self.year, self.season, self.day, self.hour, self.minute, self.second]))
+        return self._seconds
 
     @property
     def number(self):
-        return self.as_seconds
+        return self._seconds
+
+    def __int__(self):
+        return self._seconds
+
+    def __hash__(self):
+        return hash(self._seconds)
 
     def __repr__(self):
         return (
@@ -286,49 +371,74 @@ class datetime(DateObject):
         )
 
     @classmethod
-    def from_expression(cls, expression, now=None, timeline=None):
-        return parser(now=now, timeline=timeline).parse(expression)
+    def from_expression(cls, expression, now=None, timeline=None, version=None):
+        return parser(now=now, timeline=timeline, version=version).parse(expression)
 
     @classmethod
     def from_seconds(cls, seconds):
         """
         Return a datetime object corresponding to the given number of seconds since the beginning.
         """
-        for (era, years) in enumerate(Era.years):
-            if years is None:
-                break
-            era_length = years * Year.length_in_seconds
-            if seconds > era_length:
-                seconds -= era_length
-            else:
-                break
+        seconds = int(seconds)
+        if seconds < 0:
+            raise InvalidDateError("{}: dates cannot precede the beginning of time".format(seconds))
+        dt = cls.__new__(cls)
+        dt._reset(seconds)
+        return dt
 
-        year = int((seconds) / Year.length_in_seconds)
-        y_sec = year * Year.length_in_seconds
 
-        season = int((seconds - y_sec) / Season.length_in_seconds)
-        s_sec = season * Season.length_in_seconds
+def _decompose(seconds):
+    """
+    Split seconds since the beginning of time into integer (era, year, season, day, hour, minute, second) components.
+    """
+    era = 1
+    for years in Era.years:
+        if years is None or seconds < years * Year.length_in_seconds:
+            break
+        seconds -= years * Year.length_in_seconds
+        era += 1
+
+    (year, seconds) = divmod(seconds, Year.length_in_seconds)
+    (season, seconds) = divmod(seconds, Season.length_in_seconds)
+    (day, seconds) = divmod(seconds, Day.length_in_seconds)
+    (hour, seconds) = divmod(seconds, Hour.length_in_seconds)
+    (minute, second) = divmod(seconds, Minute.length_in_seconds)
+    return (era, year + 1, season + 1, day + 1, hour, minute, second)
+
+
+def from_seconds_many(seconds):
+    """
+    Split an array of seconds since the beginning of time into arrays of components in one vectorized pass. Requires
+    numpy.
 
-        day = int((seconds - y_sec - s_sec) / Day.length_in_seconds)
-        d_sec = day * Day.length_in_seconds
+    Args:
+        seconds (array-like): A numpy array, array.array or sequence of integer seconds
 
-        hour = int((seconds - y_sec - s_sec - d_sec) / Hour.length_in_seconds)
-        h_sec = hour * Hour.length_in_seconds
+    Returns:
+        tuple: numpy arrays of the (era, year, season, day, hour, minute, second) components, in the order of
+            datetime.parts
 
-        minute = int((seconds - y_sec - s_sec - d_sec - h_sec) / Minute.length_in_seconds)
-        m_sec = minute * Minute.length_in_seconds
+    Raises:
+        ReckoningError: If numpy is not installed
+        InvalidDateError: If any of the values is negative
+    """
+    if numpy is None:
+        raise ReckoningError("from_seconds_many() requires numpy.")
 
-        seconds = seconds - y_sec - s_sec - d_sec - h_sec - m_sec
+    seconds = numpy.asarray(seconds, dtype=numpy.int64)
+    if seconds.size and seconds.min() < 0:
+        raise InvalidDateError("dates cannot precede the beginning of time")
 
-        return cls(
-            era=era + 1,
-            year=year + 1,
-            season=season + 1,
-            day=day + 1,
-            hour=hour,
-            minute=minute,
-            second=seconds
-        )
+    era_starts = numpy.cumsum([0] + [years for years in Era.years if years is not None]) * Year.length_in_seconds
+    era = numpy.searchsorted(era_starts, seconds, side='right')
+    seconds = seconds - era_starts[era - 1]
+
+    (year, seconds) = numpy.divmod(seconds, Year.length_in_seconds)
+    (season, seconds) = numpy.divmod(seconds, Season.length_in_seconds)
+    (day, seconds) = numpy.divmod(seconds, Day.length_in_seconds)
+    (hour, seconds) = numpy.divmod(seconds, Hour.length_in_seconds)
+    (minute, second) = numpy.divmod(seconds, Minute.length_in_seconds)
+    return (era, year + 1, season + 1, day + 1, hour, minute, second)
 
 
 class Minute(DateObject):
@@ -345,9 +455,13 @@ class Minute(DateObject):
     length_in_seconds = 60
 
     def __init__(self, minute):
+        Minute.validate(minute)
+        self.minute = minute
+
+    @staticmethod
+    def validate(minute):
         if minute < 0 or minute > 59:
             raise InvalidMinuteError("minute {} must be between 0 and 59")
-        self.minute = minute
 
     @property
     def as_seconds(self):
@@ -379,9 +493,13 @@ class Hour(DateObject):
     }
 
     def __init__(self, hour):
+        Hour.validate(hour)
+        self.hour = hour
+
+    @staticmethod
+    def validate(hour):
         if hour < 0 or hour > 23:
             raise InvalidHourError("hour {} must be between 0 and 23")
-        self.hour = hour
 
     @property
     def as_seconds(self):
@@ -426,13 +544,16 @@ class Day(DateObject):
             day_of_season (int): The day of the season between 1 and 45.
             season (Season): optional, specify a Season instance for this day.
         """
+        Day.validate(day_of_season)
+        self.day_of_season = day_of_season
+        self.season = season
+
+    @staticmethod
+    def validate(day_of_season):
         if day_of_season < 1 or day_of_season > Season.length_in_days:
             raise InvalidDayError("{}: day_of_season must be between 1 and {}".format(
                 day_of_season, Season.length_in_days))
 
-        self.day_of_season = day_of_season
-        self.season = season
-
     @property
     def number(self):
         return self.day_of_season
@@ -492,14 +613,18 @@ class Season(DateObject):
     length_in_seconds = length_in_days * Day.length_in_seconds
 
     def __init__(self, season_of_year, year):
-        if season_of_year < 1 or season_of_year > len(Season.names):
-            raise InvalidSeasonError("season_of_year {} must be between 1 and {}".format(
-                season_of_year, len(Season.names)))
+        Season.validate(season_of_year)
         self.season_of_year = season_of_year
         self.year = year
 
         self._days = []
 
+    @staticmethod
+    def validate(season_of_year):
+        if season_of_year < 1 or season_of_year > len(Season.names):
+            raise InvalidSeasonError("season_of_year {} must be between 1 and {}".format(
+                season_of_year, len(Season.names)))
+
     @property
     def number(self):
         return self.season_of_year
@@ -598,13 +723,29 @@ class Year(DateObject):
             era (int): The era
         """
         self.era = era
+        Year.validate(year, era.era)
+        self.year = year
+        self._seasons = []
+
+    @staticmethod
+    def validate(year, era):
+        """
+        Args:
+            year (int): The year of the era.
+            era (int): The number of the era
+        """
+        end = Era.years[era - 1]
         if year < 1:
             raise InvalidYearError("Years must be greater than 1.")
-        if self.era.end and year > self.era.end:
-            raise InvalidYearError("The {} ended in {}".format(self.era.long, self.era.end))
-        self.year = year
-        self.seasons = [Season(i, self) for i in range(1, Year.length_in_seasons + 1)]
-        self.seasons.append(FestivalOfTheHunt(self))
+        if end and year > end:
+            raise InvalidYearError("The {} ended in {}".format(Era.long_names[era - 1], end))
+
+    @property
+    def seasons(self):
+        if not self._seasons:
+            self._seasons = [Season(i, self) for i in range(1, Year.length_in_seasons + 1)]
+            self._seasons.append(FestivalOfTheHunt(self))
+        return self._seasons
 
     @property
     def number(self):
@@ -638,12 +779,16 @@ class Era(DateObject):
             era (int): The number of the era; must be between 1 and 3.
             end (year): The last year of the era
         """
-        if era < 1 or era > len(Era.long_names):
-            raise InvalidEraError("{}: Eras must be between 0 and {}".format(era, len(Era.long_names)))
+        Era.validate(era)
         self.era = era
         self.end = Era.years[self.era - 1]
         self.length_in_seconds = sum(Era.years[:self.era - 1]) * Year.length_in_seconds
 
+    @staticmethod
+    def validate(era):
+        if era < 1 or era > len(Era.long_names):
+            raise InvalidEraError("{}: Eras must be between 0 and {}".format(era, len(Era.long_names)))
+
     @property
     def short(self):
         return Era.short_names[self.era - 1]
@@ -672,27 +817,48 @@ class parser:
     yesterday
     tomorrow
     2 days after tomorrow
-    11 spans later than now
-    yesterday
+    2 days and 3 hours after tomorrow
+    1 year, 2 seasons and 3 days ago
+    3 days after 2 spans before 3.3206.3.36
     1000 years ago
     on 1.193.1.1
     at 2.4839.7.22
 
+    parse_range() and parse_many() also understand ranges:
+
+    between 3 days ago and tomorrow
+
     If initialized with a timeline, the parser will also support references to events:
 
     36 hours before campaign start
     11 spans after the party returns from the feywild
 
+    Expressions are tokenized and compiled into a tree by compile(), which is memoized, and the tree is
+    evaluated against 'now' and the timeline. The grammar is:
+
+        expression := 'between' date 'and' date | date
+        date       := ('on' | 'at') date | offsets modifier [date] | reference
+        offsets    := NUMBER UNIT ((',' | 'and') NUMBER UNIT)*
+        reference  := a named date, a numeric date, or a timeline event
+
+    Parsed dates are memoized in a class-wide LRU cache keyed by the expression, the value of 'now' and
+    the timeline version. A parser given a non-empty timeline without a version does not use the cache,
+    since there is no way to tell whether the timeline has changed.
+
     Class Attributes:
 
         future_modifiers (list): list of phrases that indicate a positive (future) date
         past_modifiers (list): list of phrases that indicate a negative (past) date
-        patterns (list): A list of regular expression objects that will be used, in order, to parse
-            the date expressions
+        patterns (list): Regular expressions matching the simple <value> <unit> <modifier> <start> and
+            on|at <start> forms of an expression
+        named_dates (dict): datetime instances defined by this module, keyed by lowercase name
+        units (dict): DateObject subclasses with a fixed length, keyed by lowercase name
+        cache_size (int): The maximum number of memoized expressions
 
     Instance Attributes:
         now (int): the date relative to which dates will be calculated, in seconds.
         timeline (dict): A dictionary of event datetimes
+        version: The version of the timeline, or None
 
     """
 
@@ -722,23 +888,157 @@ class parser:
         re.compile(r'(?P<modifier>on|at)\s+(?P<start>.*)'),
     ]
 
-    def __init__(self, now=None, timeline={}):
+    _token = re.compile(r'\d+(?:\.\d+)+|\d+|,|[^\s,]+')
+
+    # populated at the end of the module, once the named dates exist
+    named_dates = {}
+    units = {}
+
+    cache_size = 1024
+    _cache = OrderedDict()
+    _stats = {'hits': 0, 'misses': 0}
+
+    def __init__(self, now=None, timeline=None, version=None):
         """
         Constructor
 
         Args:
             now (datetime): the date against which calculate the relative date
             timeline (dict): a dictionary of event datetimes keyed by description
+            version: a value that changes whenever the timeline changes, such as Timeline.version
         """
-        self.timeline = timeline
+        self.timeline = timeline or {}
+        self.version = version
 
         if not now:
             self.now = today.as_seconds
         else:
+            event = self._lookup_event(str(now))
+            self.now = int(now) if event is None else int(event)
+
+    @classmethod
+    def cache_info(cls):
+        """
+        Return a dictionary of the memo cache's hits, misses and current size.
+        """
+        return dict(cls._stats, size=len(cls._cache))
+
+    @classmethod
+    def clear_cache(cls):
+        cls._cache.clear()
+        cls._stats.update(hits=0, misses=0)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def compile(expression):
+        """
+        Compile an expression into a tree of tuples:
+
+            ('offset', seconds, date)   seconds to add to a date
+            ('reference', text)         a named date, numeric date or timeline event
+            ('range', candidates)       (start, end) pairs of dates, one for each way of splitting the range on 'and'
+
+        Args:
+            expression (str): The expression to compile
+
+        Returns:
+            tuple: The root of the tree
+
+        Raises:
+            ParseError: If the expression is empty or a range is malformed
+        """
+        tokens = [(m.group(0), m.start(), m.end()) for m in parser._token.finditer(expression)]
+        if not tokens:
+            raise ParseError("Cannot parse an empty expression")
+
+        if tokens[0][0].lower() != 'between':
+            return parser._compile_date(expression, tokens)
+
+        candidates = tuple(
+            (parser._compile_date(expression, tokens[1:i]), parser._compile_date(expression, tokens[i + 1:]))
+            for i in range(2, len(tokens) - 1)
+            if tokens[i][0].lower() == 'and'
+        )
+        if not candidates:
+            raise ParseError("Could not parse range expression '{}'".format(expression))
+        return ('range', candidates)
+
+    @staticmethod
+    def _compile_date(expression, tokens):
+        if not tokens:
+            return ('reference', 'now')
+
+        words = [token[0].lower() for token in tokens]
+        if words[0] in ('on', 'at'):
+            return parser._compile_date(expression, tokens[1:])
+
+        # a list of offsets must be followed by a modifier; anything else is a reference
+        offset = 0
+        position = 0
+        while position + 1 < len(words) and words[position].isdigit() and parser._unit(words[position + 1]):
+            offset += int(words[position]) * parser._unit(words[position + 1]).length_in_seconds
+            position += 2
+            if position < len(words) and words[position] in (',', 'and'):
+                position += 1
+
+        if position:
+            for modifier in parser.future_modifiers + parser.past_modifiers:
+                length = len(modifier.split())
+                if ' '.join(words[position:position + length]) == modifier:
+                    if modifier in parser.past_modifiers:
+                        offset = -offset
+                    start = [] if modifier == 'ago' else tokens[position + length:]
+                    return ('offset', offset, parser._compile_date(expression, start))
+
+        return ('reference', expression[tokens[0][1]:tokens[-1][2]])
+
+    @staticmethod
+    def _unit(name):
+        """
+        Return the unit class for a lowercase unit name, singular or plural, or None.
+        """
+        return parser.units.get(name) or parser.units.get(name.rstrip('s'))
+
+    def _lookup_event(self, description):
+        """
+        Return the datetime of an event in the timeline, or None. Events may be datetimes or campaign Event
+        tuples, and descriptions are matched as given or in title case.
+        """
+        for key in (description, description.title()):
+            if key in self.timeline:
+                return getattr(self.timeline[key], 'timestamp', self.timeline[key])
+        return None
+
+    def _evaluate(self, node, resolve=None):
+        """
+        Evaluate a compiled expression.
+
+        Args:
+            node (tuple): A tree returned by compile()
+            resolve (callable): optional, a function returning the seconds of a reference, or None
+
+        Returns:
+            int: The date in seconds, or a tuple of the start and end of a range
+        """
+        if node[0] == 'offset':
+            return self._evaluate(node[2], resolve) + node[1]
+
+        if node[0] == 'reference':
+            seconds = resolve(node[1]) if resolve else None
+            return int(self._parse_start(node[1])) if seconds is None else seconds
+
+        error = None
+        for (start, end) in node[1]:
             try:
-                self.now = self.timeline[str(now)].as_seconds
-            except KeyError:
-                self.now = int(now)
+                return (self._evaluate(start, resolve), self._evaluate(end, resolve))
+            except ReckoningError as e:
+                error = e
+        raise error
+
+    def _result(self, value):
+        if isinstance(value, tuple):
+            return tuple(datetime.from_seconds(seconds) for seconds in value)
+        return datetime.from_seconds(value)
 
     def parse(self, expression):
         """
@@ -749,27 +1049,92 @@ class parser:
 
         Returns:
             datetime: A datetime object
+
+        Raises:
+            ParseError: If the expression cannot be parsed, or is a range
+        """
+        value = self._parse_value(expression)
+        if isinstance(value, tuple):
+            raise ParseError("The range '{}' cannot be used as a date; use parse_range()".format(expression))
+        return self._result(value)
+
+    def parse_range(self, expression):
+        """
+        Parse a range expression, such as 'between 3 days ago and tomorrow', relative to 'now'.
+
+        Args:
+            expression (str): The expression to parse.
+
+        Returns:
+            tuple: The start and end datetime objects of the range
+
+        Raises:
+            ParseError: If the expression cannot be parsed, or is not a range
         """
-        for pattern in parser.patterns:
-            m = pattern.match(expression)
-            if m:
-                return datetime.from_seconds(self.calculate_date(**m.groupdict()))
-        raise ParseError("Could not parse expression '{}' using any pattern".format(expression))
+        value = self._parse_value(expression)
+        if not isinstance(value, tuple):
+            raise ParseError("'{}' is not a range expression".format(expression))
+        return self._result(value)
 
-    def _parse_value(self, value, unit):
+    def _parse_value(self, expression):
         """
-        Convert a value into integer seconds.
+        Evaluate an expression to seconds, or a tuple of them for a range, using the memo cache where possible.
+        """
+        key = None
+        if self.version is not None or not self.timeline:
+            key = (expression, self.now, self.version)
+            if key in parser._cache:
+                parser._cache.move_to_end(key)
+                parser._stats['hits'] += 1
+                return parser._cache[key]
+            parser._stats['misses'] += 1
+
+        value = self._evaluate(parser.compile(expression))
+        if key is not None:
+            parser._cache[key] = value
+            while len(parser._cache) > parser.cache_size:
+                parser._cache.popitem(last=False)
+        return value
+
+    def parse_many(self, expressions):
+        """
+        Parse a script of expressions that may refer to each other's descriptions as well as to the timeline,
+        eg. {'Campaign start': 'on 3.3206.1.1', 'Party sets out': '3 days after campaign start'}. Expressions
+        are resolved in dependency order, and each one is resolved only once no matter how often it is referenced.
 
         Args:
-            value (int): the value to convert (eg. "2", "37")
-            unit (str): The units to convert to seconds (eg. "Days", "Year")
+            expressions (dict): Expressions keyed by the description of the event they date
 
         Returns:
-            int: The integer seconds of value * units, or 0 if either of value or unit is None
+            dict: datetime objects (or tuples of them, for ranges) keyed by description
+
+        Raises:
+            ParseError: If an expression cannot be parsed or the references are circular
         """
-        if None not in (value, unit):
-            return int(value) * self.get_unit_class(unit).length_in_seconds
-        return 0
+        script = dict((description.title(), expression) for (description, expression) in expressions.items())
+        resolved = {}
+        pending = set()
+
+        def evaluate(description):
+            if description not in resolved:
+                if description in pending:
+                    raise ParseError("Circular reference to '{}'".format(description))
+                pending.add(description)
+                resolved[description] = self._evaluate(parser.compile(script[description]), resolve)
+                pending.discard(description)
+            return resolved[description]
+
+        def resolve(reference):
+            if reference.title() not in script:
+                return None
+            seconds = evaluate(reference.title())
+            if isinstance(seconds, tuple):
+                raise ParseError("The range '{}' cannot be used as a date".format(reference))
+            return seconds
+
+        return dict(
+            (description, self._result(evaluate(description.title()))) for description in expressions
+        )
 
     def _parse_start(self, expression):
         """
@@ -792,86 +1157,181 @@ class parser:
         """
 
         # if there is no start, use 'now', ie, whatever the parser was seeded with for now
-        if not expression:
+        if not expression or expression.lower() == 'now':
             return self.now
 
         # if start is a member of the timeline, use the date associated with that event
-        if expression in self.timeline:
-            return self.timeline[expression]
+        event = self._lookup_event(expression)
+        if event is not None:
+            return event
 
         # the start might be a datetime instance defined by this module ('yesterday', 'today', etc)
+        if expression.lower() in parser.named_dates:
+            return parser.named_dates[expression.lower()]
+
+        # the start might be a numeric date string of era, year, season, day, hour, minute and second
+        parts = expression.split('.')
+        if len(parts) > 7:
+            raise ParseError("Unable to parse date exprssion {}".format(expression))
         try:
-            return [
-                i for i in inspect.getmembers(sys.modules[__name__])
-                if isinstance(i[1], datetime) and str(i[0]).lower() == expression.lower()
-            ][0][1]
-        except IndexError:
-            pass
-
-        # the start might be a numeric date string
-        try:
-            return datetime(*(map(int, expression.split('.'))))
+            return datetime(*(map(int, parts)))
         except ValueError:
             raise ParseError("Unable to parse date exprssion {}".format(expression))
 
-    def calculate_date(self, modifier, start='', value=None, unit=None):
+    def get_unit_class(self, unit):
         """
-        Calculate a date by parsing a modifier sub-expression, possibly with a value and unit,
-        and applying it to the starting date.
+        Returns the class referenced by the unit string (Era, Year, Season, Span, Day, Hour, etc).
+        Plurals will be stripped and capialization will be forced, so 'minutes' is equivalent to
+        'Minute'.
 
         Args:
-            modifier (str): A string specifying what kind of calculation to make; must be a member
-                of past_modifiers, future_modifiers, 'at', or 'on'.
-            start (str): The expression defining the date to apply the calculation to
-            value (str): A string of digits
-            unit (str): A string referencing time units defined by this module (eg. day, years, etc)
+            unit (str): The name of the unit of time to look up in this module
 
         Returns:
-            datetime: The datetime object
-
-        Raises:
-            ParseError: If a date cannot be calculated from input
+            DateObject: The subclass of DateObject
         """
+        unit_class = parser._unit(unit.lower())
+        if not unit_class:
+            raise ParseError("Could not find a datetime object for {}".format(unit))
+        return unit_class
 
-        if modifier == 'ago':
-            start = 'now'
 
-        start = start.strip()
-        if not start:
-            start = 'now'
+def daterange(start, end, step=Day.length_in_seconds):
+    """
+    Yield dates from start up to, but not including, end, as integer seconds since the beginning of time.
 
-        offset = self._parse_value(value, unit)
-        start = self._parse_start(start)
+    Args:
+        start (datetime or int): The first date
+        end (datetime or int): The date at which to stop
+        step (int or DateObject subclass): The interval between dates, in seconds or as a unit such as Span
 
-        if modifier.lower() in ('at', 'on'):
-            return start.as_seconds
-        elif modifier.lower() in self.past_modifiers:
-            return int(start) - offset
-        elif modifier.lower() in self.future_modifiers:
-            return int(start) + offset
-        else:
-            raise ParseError("Could not parse range modifier '{}'".format(modifier))
+    Returns:
+        generator: A generator yielding integer seconds
+    """
+    if inspect.isclass(step):
+        step = step.length_in_seconds
+    yield from range(int(start), int(end), int(step))
 
-    def get_unit_class(self, unit):
-        """
-        Returns the class referenced by the unit string (Era, Year, Season, Span, Day, Hour, etc).
-        Plurals will be stripped and capialization will be forced, so 'minutes' is equivalent to
-        'Minute'.
 
-        Args:
-            unit (str): The name of the unit of time to look up in this module
+_ordinals = ['first', 'second', 'third', 'fourth', 'fifth']
+
+_recurrence_patterns = [
+    re.compile(r'every\s+(?P<unit>day|span|season|year)$'),
+    re.compile(r'every\s+(?P<name>.+?)$'),
+    re.compile(
+        r'(?:the\s+)?(?P<ordinal>{}|last|\d+(?:st|nd|rd|th)?)\s+day\s+of\s+(?:each|every|the)\s+'.format(
+            '|'.join(_ordinals)) +
+        r'(?P<unit>span|season|year)$'
+    ),
+]
 
-        Returns:
-            DateObject: The subclass of DateObject
-        """
-        names = [unit.title(), unit.title().rstrip('s')]
-        for (name, obj) in inspect.getmembers(sys.modules[__name__], inspect.isclass):
-            if name in names:
-                return obj
-        raise ParseError("Could not find a datetime object for {}".format(unit))
+
+@lru_cache(maxsize=128)
+def _recurrence_offsets(rule):
+    """
+    Compile a recurrence rule into the sorted offsets, in seconds from the start of a year, at which it occurs.
+    Every recurrence repeats yearly, since years have a fixed length and eras begin at the start of a year.
+    """
+    rule = ' '.join(rule.lower().split())
+    for pattern in _recurrence_patterns:
+        m = pattern.match(rule)
+        if m:
+            break
+    else:
+        raise ParseError("Could not parse recurrence rule '{}'".format(rule))
+
+    # the first day of every span, season, festival and year
+    spans = [i * Span.length_in_seconds for i in range(Year.length_in_spans)]
+    seasons = [i * Season.length_in_seconds for i in range(Year.length_in_seasons)]
+    festival = Year.length_in_seasons * Season.length_in_seconds
+
+    found = m.groupdict()
+    if found.get('name'):
+        name = found['name']
+        if name in ('festival of the hunt', 'the festival of the hunt'):
+            return (festival, )
+        day_names = [day.lower() for day in Day.names]
+        festival_names = [day.lower() for day in FestivalOfTheHunt.day_names]
+        if name.rstrip('s') in day_names:
+            day = day_names.index(name.rstrip('s')) * Day.length_in_seconds
+            return tuple(span + day for span in spans if span < festival)
+        if name in festival_names:
+            return (festival + festival_names.index(name) * Day.length_in_seconds, )
+        raise ParseError("Could not parse recurrence rule '{}'".format(rule))
+
+    if not found.get('ordinal'):
+        return {
+            'day': tuple(range(0, Year.length_in_seconds, Day.length_in_seconds)),
+            'span': tuple(spans),
+            'season': tuple(seasons),
+            'year': (0, ),
+        }[found['unit']]
+
+    (starts, length) = {
+        'span': (spans, Span.length_in_days),
+        'season': (seasons, Season.length_in_days),
+        'year': ([0], Year.length_in_days),
+    }[found['unit']]
+    ordinal = found['ordinal']
+    if ordinal == 'last':
+        day = length
+    elif ordinal in _ordinals:
+        day = _ordinals.index(ordinal) + 1
+    else:
+        day = int(ordinal.rstrip('stndrh'))
+    if day < 1 or day > length:
+        raise ParseError("There is no {} day of a {}".format(ordinal, found['unit']))
+    return tuple(start + (day - 1) * Day.length_in_seconds for start in starts)
+
+
+def recurrence(rule, start, end=None):
+    """
+    Yield the dates on which a recurring event occurs, as integer seconds since the beginning of time. Dates are
+    computed arithmetically, so no component objects are created. Rules include:
+
+        every day / span / season / year
+        every Freydag
+        every Festival of the Hunt
+        every Freya's Hunt
+        first day of each season
+        last day of each span
+        100th day of the year
+
+    Args:
+        rule (str): The recurrence rule
+        start (datetime or int): The earliest date to yield
+        end (datetime or int): optional, the date at which to stop; if not specified, the generator is infinite
+
+    Returns:
+        generator: A generator yielding integer seconds
+
+    Raises:
+        ParseError: If the rule cannot be parsed
+    """
+    offsets = _recurrence_offsets(rule)
+    start = int(start)
+    (year_start, offset) = divmod(start, Year.length_in_seconds)
+    year_start *= Year.length_in_seconds
+    index = bisect_left(offsets, offset)
+    while True:
+        for offset in offsets[index:]:
+            date = year_start + offset
+            if end is not None and date >= int(end):
+                return
+            yield date
+        index = 0
+        year_start += Year.length_in_seconds
 
 
 # helpful shortcuts for importing and hints for the parser
 now = datetime(year=3207, season=1, day=5, era=3)
 today = now
 yesterday = today - Day.length_in_seconds
+
+parser.named_dates.update(
+    (name, obj) for (name, obj) in inspect.getmembers(sys.modules[__name__]) if isinstance(obj, datetime)
+)
+parser.units.update(
+    (name.lower(), obj) for (name, obj) in inspect.getmembers(sys.modules[__name__], inspect.isclass)
+    if issubclass(obj, DateObject) and isinstance(obj.length_in_seconds, int)
+)
@@ -1,6 +1,7 @@
 from telisar.bot.plugins import hoarding
 from telisar import bag_of_hoarding
 from conftest import msg_factory
+import os
 import pytest
 
 
@@ -26,3 +27,31 @@ def test_run(plugin, message, expected_lines):
 
 def test_HoardItem(env):
     assert bag_of_hoarding.HoardItem()
+
+
+def test_HoardItem_sample(env):
+    items = bag_of_hoarding.HoardItem.sample(50)
+    assert len(items) == 50
+    for item in items:
+        assert str(item) == str(item)
+        assert '\n' not in str(item)
+
+
+def test_WordList():
+    nouns = bag_of_hoarding.WordList(os.path.join(bag_of_hoarding.DATA, 'nouns'))
+    assert nouns.bytes_resident == 0
+    with open(nouns.path) as f:
+        lines = [line.strip() for line in f]
+    assert len(nouns) == len(lines)
+    for i in (0, 1, len(lines) - 1):
+        assert nouns[i] == lines[i]
+    assert nouns.load_time is not None
+    assert nouns.bytes_resident > os.path.getsize(nouns.path)
+
+
+def test_get_vocabulary():
+    vocabulary = bag_of_hoarding.get_vocabulary()
+    assert vocabulary is bag_of_hoarding.get_vocabulary()
+    assert bag_of_hoarding.HoardItem()._vocabulary is vocabulary
+    str(bag_of_hoarding.HoardItem())
+    assert set(vocabulary.metrics) == set(['nouns', 'adjectives'])
@@ -0,0 +1,38 @@
+import pytest
+from telisar.reckoning import calendar, campaign, telisaran
+
+
+def test_render_year():
+    cal = calendar.Calendar(events={'Midsummer': telisaran.datetime(era=3, year=100, season=4, day=23)})
+    seasons = list(cal.render_seasons(telisaran.datetime(era=3, year=100), telisaran.datetime(era=3, year=101)))
+    assert len(seasons) == 9
+    assert seasons[0].startswith('Season of the Fox, 100 ME\n Sy Mi Wo Th Fr\n 01 02 03 04 05\n')
+    assert seasons[3].splitlines()[6] == ' 21 22*23 24 25'
+    assert seasons[3].endswith('\n23: Midsummer\n')
+    assert seasons[-1].splitlines() == ['The Festival Of The Hunt, 100 ME', ' Sy Mi Wo Th Fr', ' 01 02 03 04 05']
+    assert cal.year(100, era=3) == '\n'.join(seasons)
+
+
+@pytest.mark.parametrize('format, marker', [
+    ('markdown', '| 21 | 22 | **23** | 24 | 25 |'),
+    ('html', '<td class="event" title="REDACTED">23</td>'),
+])
+def test_render_formats(format, marker):
+    event = campaign.Event(timestamp=telisaran.datetime(era=3, year=100, season=4, day=23), redacted=True)
+    cal = calendar.Calendar(events={'Secret': event})
+    rendered = cal.years(99, 101, era=3, format=format)
+    assert rendered.count(marker) == 1
+    assert 'Secret' not in rendered
+    with pytest.raises(ValueError):
+        cal.year(100, era=3, format='pdf')
+
+
+def test_render_range():
+    cal = calendar.Calendar()
+    start = telisaran.datetime(era=1, year=20000, season=8, day=40)
+    seasons = list(cal.render_seasons(start, int(start) + 12 * telisaran.Day.length_in_seconds))
+    assert [season.splitlines()[0] for season in seasons] == [
+        'Season of the Bear, 20000 AE',
+        'The Festival Of The Hunt, 20000 AE',
+        'Season of the Fox, 1 OE',
+    ]
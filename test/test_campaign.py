@@ -0,0 +1,171 @@
+import json
+import pytest
+from telisar.reckoning import campaign, telisaran
+
+DAY = telisaran.Day.length_in_seconds
+
+
+@pytest.fixture
+def timeline(tmp_path):
+    datafile = tmp_path / 'timeline.json'
+    datafile.write_text(json.dumps({
+        'Today': [10 * DAY, False],
+        'Campaign Start': [2 * DAY, False],
+        'The Betrayal': [5 * DAY, True],
+        'Also Day Five': [5 * DAY, False],
+    }))
+    return campaign.Timeline(str(datafile))
+
+
+def test_index(timeline):
+    assert list(timeline.as_markdown)[1:] == [
+        '| *1.1.1.03* | Campaign Start\n',
+        '| *1.1.1.06* | Also Day Five\n',
+        '| *1.1.1.06* | REDACTED\n',
+        '| *1.1.1.11* | Today\n',
+    ]
+    timeline._add('The Betrayal', telisaran.datetime.from_seconds(DAY))
+    timeline._add('Fourth', telisaran.datetime.from_seconds(4 * DAY))
+    timeline._del('Also Day Five')
+    assert timeline._timestamps == [DAY, 2 * DAY, 4 * DAY, 10 * DAY]
+    assert timeline._descriptions == ['The Betrayal', 'Campaign Start', 'Fourth', 'Today']
+
+
+def test_between(timeline):
+    assert [d for (d, e) in timeline.between(2 * DAY, 10 * DAY)] == ['Campaign Start', 'Also Day Five', 'The Betrayal']
+    assert [d for (d, e) in timeline.between('on campaign start', '1 day after the betrayal')] == [
+        'Campaign Start', 'Also Day Five', 'The Betrayal']
+    assert timeline.between(11 * DAY, 20 * DAY) == []
+    assert [d for (d, e) in timeline.search('Day five')] == ['Also Day Five']
+    with pytest.raises(telisaran.ParseError):
+        timeline.record('Somewhen', 'between 1.1.1.1 and 1.1.1.5')
+    assert 'Somewhen' not in timeline._events
+
+
+def test_before(timeline):
+    (description, event) = timeline.before(5 * DAY)
+    assert description == 'Campaign Start'
+    assert int(event.timestamp) == 2 * DAY
+    assert timeline.before('on today')[0] == 'The Betrayal'
+    assert timeline.before(2 * DAY) is None
+
+
+def test_journal(timeline, tmp_path):
+    datafile = tmp_path / 'timeline.json'
+    journal = tmp_path / 'timeline.json.journal'
+    snapshot = datafile.read_text()
+
+    timeline.record('The Heist', 'on 1.1.1.8')
+    timeline.forward(2)
+    timeline.expunge('also day five')
+    assert datafile.read_text() == snapshot
+    assert [json.loads(line)['op'] for line in journal.read_text().splitlines()] == ['add', 'today', 'del']
+
+    reloaded = campaign.Timeline(str(datafile))
+    assert reloaded._descriptions == ['Campaign Start', 'The Betrayal', 'The Heist', 'Today']
+    assert int(reloaded.today) == 12 * DAY
+
+    # a crashed writer's incomplete record is ignored, then overwritten
+    with open(journal, 'a') as f:
+        f.write('{"op": "del", "descr')
+    reloaded = campaign.Timeline(str(datafile))
+    assert 'The Heist' in reloaded._events
+    reloaded.expunge('The Heist')
+    assert [json.loads(line)['op'] for line in journal.read_text().splitlines()] == ['add', 'today', 'del', 'del']
+
+
+def test_journal_concurrent_writers(timeline, tmp_path):
+    datafile = str(tmp_path / 'timeline.json')
+    other = campaign.Timeline(datafile)
+    timeline.record('First', 'on 1.1.1.20')
+    other.record('Second', '1 day after first')
+    timeline.record('Third', '1 day after second')
+    assert [d for (d, e) in campaign.Timeline(datafile).between(19 * DAY, 30 * DAY)] == ['First', 'Second', 'Third']
+
+
+def test_journal_compaction(timeline, tmp_path, monkeypatch):
+    datafile = tmp_path / 'timeline.json'
+    journal = tmp_path / 'timeline.json.journal'
+    other = campaign.Timeline(str(datafile))
+
+    monkeypatch.setattr(campaign.Timeline, 'compact_after', 3)
+    for day in range(1, 4):
+        timeline.forward()
+    assert journal.read_text() == ''
+    assert json.loads(datafile.read_text())['Today'][0] == 13 * DAY
+
+    # a writer that last read the old journal reloads the new snapshot before committing
+    other.record('Later', '1 day after today')
+    assert int(other._events['Later'].timestamp) == 14 * DAY
+    assert campaign.Timeline(str(datafile))._events == other._events
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = campaign.SQLiteTimeline(str(tmp_path / 'timelines.db'), campaign='noobhammer')
+    with db._journaled():
+        db._add('Today', telisaran.datetime.from_seconds(10 * DAY))
+        db._add('Campaign Start', telisaran.datetime.from_seconds(2 * DAY))
+        db._add('The Betrayal', telisaran.datetime.from_seconds(5 * DAY), redacted=True)
+        db._add('Also Day Five', telisaran.datetime.from_seconds(5 * DAY))
+    return db
+
+
+def test_sqlite_interface(database, timeline, tmp_path):
+    assert list(database.as_markdown) == list(timeline.as_markdown)
+    assert database.list == timeline.list
+    assert database.between('on campaign start', '1 day after the betrayal') == timeline.between(2 * DAY, 6 * DAY)
+    assert database.before(5 * DAY) == timeline.before(5 * DAY)
+    assert database.before(2 * DAY) is None
+    assert database.redacted() == timeline.redacted() == [('The Betrayal', timeline._events['The Betrayal'])]
+
+    database.record('The Heist', '3 days after the betrayal')
+    assert database.forward(2) == 12 * DAY
+    database.expunge('also day five')
+    with pytest.raises(KeyError):
+        database.expunge('also day five')
+    assert json.loads(database.as_json) == {
+        'Campaign Start': [2 * DAY, False],
+        'The Betrayal': [5 * DAY, True],
+        'The Heist': [8 * DAY, False],
+        'Today': [12 * DAY, False],
+    }
+
+
+def test_sqlite_campaigns(database, timeline, tmp_path):
+    other = campaign.SQLiteTimeline(database._database, campaign='tomb of horrors')
+    assert len(other._events) == 0
+    other.import_timeline(timeline._datafile)
+    other.record('The Lich Awakens', 'on 1.1.2.1')
+    assert database.campaigns() == ['noobhammer', 'tomb of horrors']
+    assert 'The Lich Awakens' not in database._events
+
+    # changes made by another connection invalidate cached dates
+    version = database.version
+    campaign.SQLiteTimeline(database._database, campaign='noobhammer').forward()
+    assert database.version != version
+    assert int(database.today) == 11 * DAY
+
+
+def test_sqlite_search(database):
+    database.record('The party returns from the Feywild', 'on 1.1.1.9')
+    assert [d for (d, e) in database.search('feywild')] == ['The Party Returns From The Feywild']
+    assert [d for (d, e) in database.search('day five')] == ['Also Day Five']
+    assert database.search('"unbalanced') == []
+
+
+def test_lazy_loading(timeline, tmp_path):
+    assert timeline._sorted_timestamps is None
+    assert not any(isinstance(event, campaign.Event) for event in timeline._events._raw.values())
+
+    timeline.forward()
+    assert timeline._sorted_timestamps is None
+    assert [d for (d, e) in timeline._events._raw.items() if isinstance(e, campaign.Event)] == ['Today']
+    assert json.loads(timeline.as_json)['Campaign Start'] == [2 * DAY, False]
+    assert 'Campaign Start' in timeline._events and 'Nothing' not in timeline._events
+    assert not isinstance(timeline._events._raw['Campaign Start'], campaign.Event)
+
+    # events are materialized once and cached
+    assert timeline._events['Campaign Start'] is timeline._events['Campaign Start']
+    assert timeline.before(3 * DAY)[0] == 'Campaign Start'
+    assert timeline._sorted_timestamps == [2 * DAY, 5 * DAY, 5 * DAY, 11 * DAY]
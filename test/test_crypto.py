@@ -59,3 +59,102 @@ def test_decrypt(c, primer, msg, plaintext):
 ])
 def test_pretty_encrypt(c, primer, msg, expected):
     assert c.pretty_encrypt(primer, msg) == expected
+
+
+def test_decrypt_long_message(c):
+    message = ''.join(c.alphabet[(i * 7) % len(c.alphabet)] for i in range(10000))
+    encrypted = ' '.join(str(x) for x in c.encrypt('sabetha', message))
+    assert ''.join(c.decrypt('sabetha', encrypted)) == message.upper()
+    with pytest.raises(ValueError):
+        c.decrypt('sabetha', '999 1')
+
+
+def test_benchmark(c):
+    result = c.benchmark(length=1000)
+    assert result['length'] == 1000
+    assert result['encrypt_chars_per_second'] > 0
+    assert result['decrypt_chars_per_second'] > 0
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 64 * 1024])
+def test_streams(c, chunk_size):
+    import io
+    message = 'Keep sons whereabouts hidden; kill Keen for Handsome Henry Smalls! ' * 20
+    encrypted = io.StringIO()
+    assert c.encrypt_stream('brescht', io.StringIO(message), encrypted, chunk_size=chunk_size) == 1100
+    assert encrypted.getvalue() == c.pretty_encrypt('brescht', message) + '\n'
+
+    decrypted = io.StringIO()
+    encrypted.seek(0)
+    assert c.decrypt_stream('brescht', encrypted, decrypted, chunk_size=chunk_size) == 1100
+    assert decrypted.getvalue() == c.pretty_decrypt('brescht', encrypted.getvalue()) + '\n'
+    assert decrypted.getvalue().replace(' ', '').replace('\n', '') == c.normalize(message).upper()
+
+
+def test_arrays(c):
+    pytest.importorskip('numpy')
+    message = 'Keep sons whereabouts hidden; kill Keen for Handsome Henry Smalls! ' * 20
+    encrypted = c.encrypt_array('brescht', message)
+    assert encrypted.tolist() == c.encrypt('brescht', message)
+    assert c.format_blocks(encrypted) == c.pretty_encrypt('brescht', message)
+
+    decrypted = c.decrypt_array('brescht', encrypted)
+    assert decrypted.tolist() == c.decrypt('brescht', c.pretty_encrypt('brescht', message))
+    assert c.format_blocks(decrypted) == c.pretty_decrypt('brescht', c.pretty_encrypt('brescht', message))
+    assert ''.join(c.decrypt_array('brescht', c.pretty_encrypt('brescht', message))) == c.normalize(message).upper()
+    assert len(c.decrypt_array('brescht', '')) == 0
+    with pytest.raises(ValueError):
+        c.decrypt_array('sabetha', '999 1')
+
+
+def test_randomize(c):
+    message = 'Keep sons whereabouts hidden; kill Keen for Handsome Henry Smalls! ' * 20
+    encrypted = crypto.ElethisCipher(randomize=True, seed=1).encrypt('brescht', message)
+    assert encrypted == crypto.ElethisCipher(randomize=True, seed=1).encrypt('brescht', message)
+    assert encrypted != c.encrypt('brescht', message)
+    assert ''.join(c.decrypt('brescht', ' '.join(map(str, encrypted)))) == c.normalize(message).upper()
+
+    # every coordinate of a letter gets used
+    plaintext = crypto.ElethisCipher(randomize=True, seed=1)._plaintext('a' * 100 + 'j' * 100)
+    assert set(plaintext) == {0, 36, 72, 9, 45, 81}
+
+
+def test_randomize_arrays(c):
+    pytest.importorskip('numpy')
+    message = 'Keep sons whereabouts hidden; kill Keen for Handsome Henry Smalls! ' * 20
+    encrypted = crypto.ElethisCipher(randomize=True, seed=1).encrypt_array('brescht', message)
+    assert encrypted.tolist() == crypto.ElethisCipher(randomize=True, seed=1).encrypt('brescht', message)
+    assert ''.join(c.decrypt_array('brescht', encrypted)) == c.normalize(message).upper()
+
+
+@pytest.fixture
+def model():
+    return crypto.NgramModel([
+        'the ledger is hidden beneath the floor of the old mill',
+        'keep sons whereabouts hidden', 'meet me at midnight', 'kill keen for handsome henry smalls',
+    ])
+
+
+def test_NgramModel(model):
+    assert model.score('thehiddenledger') > model.score('xq7z0vk3jwq9p2b')
+    assert model.score('a') == model.floor
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_crack(c, model, workers, tmp_path):
+    encrypted = c.pretty_encrypt('brescht', 'The ledger is hidden beneath the floor of the old mill')
+    keys = [f'wrong{i}' for i in range(1000)] + ['Brescht'] + [f'unused{i}' for i in range(1000)]
+    result = crypto.crack(encrypted, keys, workers=workers, model=model, chunk_size=100)
+    assert result['key'] == 'Brescht'
+    assert result['cracked']
+    assert result['plaintext'] == 'THELEDGERISHIDDENBENEATHTHEFLOOROFTHEOLDMILL'
+    # the search stops after the chunk holding the key, unless chunks finish out of order across processes
+    assert result['tried'] == 1100 if workers == 1 else result['tried'] <= 2001
+    assert result['keys_per_second'] > 0
+
+    wordlist = tmp_path / 'wordlist'
+    wordlist.write_text('\n'.join(keys[:1000]) + '\n')
+    result = crypto.crack(encrypted, str(wordlist), workers=workers, model=model)
+    assert result['key'] is None
+    assert not result['cracked']
+    assert result['tried'] == 1000
@@ -1,7 +1,9 @@
 import pytest
 import itertools
+import collections
+import random
 
-from telisar.languages.base import BaseLanguage
+from telisar.languages.base import BaseLanguage, GraphemeAutomaton, LanguageException, SyllableFactory, grapheme
 
 
 @pytest.fixture
@@ -44,3 +46,91 @@ def test_BaseLanguage_is_valid(test_lang):
         assert lang.is_valid(word)
         assert lang.is_valid(f"x{word}") is False
         assert lang.is_valid(f"{word}x") is False
+
+
+def test_BaseLanguage_seed(test_lang):
+    syllables = [test_lang(seed=1).syllable.get() for _ in range(10)]
+    assert syllables == [test_lang(seed=1).syllable.get() for _ in range(10)]
+
+    lang = test_lang(seed=2)
+    first = [lang.syllable.get() for _ in range(10)]
+    lang.seed(2)
+    assert first == [lang.syllable.get() for _ in range(10)]
+
+
+def test_SyllableFactory_weights():
+    syllable = SyllableFactory(
+        template=('C', 'V'),
+        weights=[0, 1],
+        prefixes=[],
+        suffixes=[],
+        affixes=[],
+        vowels=[grapheme(char='a', weight=0), grapheme(char='e', weight=1)],
+        consonants=[grapheme(char='b', weight=1), grapheme(char='c', weight=0)],
+    )
+    assert set(syllable.get() for _ in range(100)) == set(['be'])
+    assert set(syllable.length() for _ in range(100)) == set([2])
+
+
+def test_BaseLanguage_validate_many(test_lang):
+    lang = test_lang()
+    assert lang.validate_many(['ba', 'xba', 'bacade', 'bax', 'o']) == [True, False, True, False, True]
+
+
+@pytest.mark.parametrize('word, expected', [
+    ('tha', True),
+    ('thath', True),
+    ('taethe', True),
+    ('ath', False),
+    ('tht', False),
+    ('th', False),
+    ('t', False),
+])
+def test_GraphemeAutomaton(word, expected):
+    automaton = GraphemeAutomaton(first=['th', 't'], middle=['a', 'e', 'th'], last=['a', 'e', 'th'])
+    assert automaton.accepts(word) is expected
+
+
+def test_SyllableFactory_get_many():
+    pytest.importorskip('numpy')
+
+    def factory():
+        return SyllableFactory(
+            template=('c', 'V', 'C|v'),
+            weights=[1],
+            prefixes=[],
+            suffixes=[],
+            affixes=[],
+            vowels=[grapheme(char='a', weight=3), grapheme(char='e', weight=1)],
+            consonants=[grapheme(char='b', weight=1), grapheme(char='th', weight=2)],
+            rng=random.Random(1),
+        )
+
+    count = 20000
+    syllable = factory()
+    scalar = collections.Counter(syllable.get() for _ in range(count))
+    batch = collections.Counter(factory().get_many(count))
+
+    assert set(batch) == set(scalar)
+    for key in scalar:
+        assert abs(scalar[key] - batch[key]) / count < 0.01
+
+    assert factory().get_many(10) == factory().get_many(10)
+
+
+def test_get_language():
+    from telisar import languages
+    from telisar.languages import elven
+
+    assert 'common' in languages.list_languages()
+    assert 'base' not in languages.list_languages()
+
+    lang = languages.get_language('elven')
+    assert isinstance(lang, elven.Elven)
+    assert lang is languages.get_language('Elven')
+    assert lang is languages.get_language(elven.Elven)
+    assert languages.get_language('elven.ElvenPerson') is languages.get_language(elven.ElvenPerson)
+
+    for name in ['klingon', 'elven.Klingon']:
+        with pytest.raises(LanguageException):
+            languages.get_language(name)
@@ -1,6 +1,7 @@
 import logging
 import pytest
 
+from telisar.languages.base import WordFactory
 from telisar.languages.elven import Elven, ElvenPerson, ElvenPlaceName
 
 
@@ -56,3 +57,22 @@ def test_existing_place_names(place, name):
 def test_invalid_names(person, name):
     assert not person.is_valid(name)
 
+
+@pytest.mark.parametrize('mode', ['rejection', 'constructive'])
+def test_word_modes(mode):
+    lang = Elven(seed=1)
+    for _ in range(100):
+        word = WordFactory(lang, mode=mode).get()
+        assert lang.validate_sequence([word])
+    assert lang.word_stats['words'] == 100
+    assert lang.retries_per_word == lang.word_stats['retries'] / 100
+
+
+def test_constructive_junctions():
+    rejection = Elven(seed=1)
+    constructive = Elven(seed=1)
+    words = [WordFactory(constructive, mode='constructive').get() for _ in range(1000)]
+    for _ in range(1000):
+        WordFactory(rejection, mode='rejection').get()
+    assert all(constructive.valid_junction(word) for word in words)
+    assert constructive.retries_per_word < rejection.retries_per_word
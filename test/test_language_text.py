@@ -0,0 +1,27 @@
+import io
+import pytest
+from telisar.languages import text
+from telisar.languages.elven import Elven
+
+
+@pytest.mark.parametrize('words', [1, 12, 500])
+def test_sentences(words):
+    sentences = list(text.sentences(Elven(seed=1), words))
+    assert sum(len(s.split()) for s in sentences) == words
+    for sentence in sentences:
+        assert sentence[0].isupper()
+        assert sentence[-1] in '?!.'
+    assert sentences[-1][-1] == '.'
+
+
+def test_paragraphs():
+    paragraphs = list(text.paragraphs(Elven(seed=1), 500, length=3))
+    assert sum(len(p.split()) for p in paragraphs) == 500
+    assert ' '.join(paragraphs) == ' '.join(text.sentences(Elven(seed=1), 500))
+
+
+def test_write():
+    fh = io.StringIO()
+    text.write(Elven(seed=1), 500, fh, paragraph_length=3)
+    assert fh.getvalue().endswith('\n')
+    assert fh.getvalue().replace('\n\n', ' ').strip() == ' '.join(text.sentences(Elven(seed=1), 500))
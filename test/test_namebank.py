@@ -0,0 +1,68 @@
+import pytest
+from telisar.npc import namebank
+
+
+@pytest.fixture
+def bank(tmp_path):
+    return namebank.NameBank('dragon', path=str(tmp_path), size=50)
+
+
+def test_get_unique(bank):
+    names = [bank.get() for _ in range(120)]
+    assert len(set(names)) == len(names)
+    assert all(name in bank for name in names)
+    assert len(bank) >= 120
+
+
+def test_persistence(tmp_path, bank):
+    served = set(bank.get() for _ in range(10))
+    bank._refill_thread and bank._refill_thread.join()
+
+    reopened = namebank.NameBank('dragon', path=str(tmp_path), size=50)
+    assert len(reopened) == len(bank)
+    assert reopened.remaining == bank.remaining
+    assert not served & set(reopened.get() for _ in range(reopened.remaining))
+
+
+def test_exhausted(tmp_path, monkeypatch):
+    bank = namebank.NameBank('dragon', path=str(tmp_path), size=5)
+    monkeypatch.setattr(bank, '_generate', lambda: [])
+    for _ in range(len(bank)):
+        bank.get()
+    with pytest.raises(namebank.NameBankError):
+        bank.get()
+
+
+def test_shared_between_processes(tmp_path):
+    # two banks on the same file stand in for two processes
+    first = namebank.NameBank('dragon', path=str(tmp_path), size=50, low_water=1)
+    second = namebank.NameBank('dragon', path=str(tmp_path), size=50, low_water=1)
+    names = [first.get() for _ in range(10)]
+    assert second.remaining == first.remaining == len(first) - 10
+
+    # a refill by one replaces the file under the other, which must remap it rather than serve from the old copy
+    second._refill()
+    assert len(first) == len(second) > 50
+    names += [bank.get() for _ in range(40) for bank in (first, second)]
+    assert len(set(names)) == len(names)
+    assert first.remaining == second.remaining
+
+
+def _bits(bank):
+    return sum(bin(byte).count('1') for byte in bytes(bank._bitmap))
+
+
+def test_used_count_in_header(tmp_path):
+    # a large bank, and a bank in the first layout, which has no count of used names
+    names = [f'name{i:06d}' for i in range(100000)]
+    filename = tmp_path / 'Dragon.bank'
+    data = namebank._pack(names, used=names[:10])
+    filename.write_bytes(b'TNB1' + data[4:8] + data[namebank._header.size:])
+
+    first = namebank.NameBank('dragon', path=str(tmp_path))
+    second = namebank.NameBank('dragon', path=str(tmp_path))
+    assert first.remaining == len(names) - 10
+    served = [bank.get() for _ in range(500) for bank in (first, second)]
+    assert len(set(served)) == len(served)
+    assert first.remaining == second.remaining == len(names) - 1010
+    assert first._used == _bits(first) == _bits(second) == 1010
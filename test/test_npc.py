@@ -0,0 +1,49 @@
+import pytest
+from telisar.npc import base
+
+
+@pytest.mark.parametrize('ancestry', ['human', 'elf', 'drow', 'dragon', None])
+def test_generate_names(ancestry):
+    names = list(base.generate_names(ancestry, count=25, seed=1, chunk_size=10))
+    assert len(names) == 25
+    assert all(names)
+    assert names == list(base.generate_names(ancestry, count=25, seed=1, chunk_size=10))
+
+
+def test_generate_names_workers():
+    serial = list(base.generate_names('elf', count=50, seed=2, chunk_size=10))
+    parallel = list(base.generate_names('elf', count=50, workers=2, seed=2, chunk_size=10))
+    assert serial == parallel
+
+
+def test_generate_names_invalid_ancestry():
+    with pytest.raises(KeyError):
+        list(base.generate_names('beholder', count=1))
+
+
+def test_generate_names_full_name():
+    names = list(base.generate_names('halfling', count=10, seed=1))
+    assert all(name.endswith('"') for name in names)
+    assert all('"the ' in name for name in base.generate_names('dragon', count=10, seed=1))
+
+
+def test_generate_names_shared_language():
+    language = base.npc_type('elf').language
+    state = language.random.getstate()
+    list(base.generate_names('elf', count=10, seed=1))
+    assert language.random.getstate() == state
+
+
+def test_generate_names_without_npcs(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("generate_names should not construct NPCs")
+    monkeypatch.setattr(base.BaseNPC, '__init__', fail)
+    assert len(list(base.generate_names('halfling', count=10, seed=1))) == 10
+
+
+def test_compose_name():
+    tiefling = base.npc_type('tiefling')
+    assert tiefling.compose_name(['akmon', 'phaedra'], nickname='torment') == 'Akmon Phaedra Torment'
+    npc = base.npc_type('halfling')(nickname='Quick')
+    assert npc.full_name == npc.compose_name(npc.names, nickname='Quick')
+    assert npc.full_name.endswith(' "Quick"')
@@ -1,6 +1,7 @@
 import pytest
 from telisar.reckoning import telisaran
 import random
+from array import array
 
 ONE_DAY_IN_SECONDS = 86400
 ONE_SEASON_IN_SECONDS = ONE_DAY_IN_SECONDS * 45
@@ -212,3 +213,182 @@ def test_parser_pattern(expression, expected):
         assert m.groupdict() == expected
         return True
     pytest.fail(f"Expression was not matched by any pattern!")
+
+
+def test_datetime_slots():
+    dt = telisaran.datetime.from_seconds(FIRST_ERA + ONE_DAY_IN_SECONDS)
+    assert not hasattr(dt, '__dict__')
+    assert dt._parts is None
+    assert dt.parts == (2, 1, 1, 2, 0, 0, 0)
+    assert dt._era is None
+    assert dt.era.long == 'Old Era'
+    assert sorted([dt, telisaran.datetime(era=1, year=1)]) == [0, dt]
+    assert len({dt, telisaran.datetime(era=2, year=1, season=1, day=2)}) == 1
+
+
+@pytest.mark.parametrize('seconds, expected', [
+    (FIRST_ERA - 1, (1, 20000, 9, 5, 23, 59, 59)),
+    (FIRST_ERA, (2, 1, 1, 1, 0, 0, 0)),
+    (FIRST_ERA + SECOND_ERA, (3, 1, 1, 1, 0, 0, 0)),
+])
+def test_datetime_era_boundaries(seconds, expected):
+    assert telisaran.datetime.from_seconds(seconds).parts == expected
+    assert int(telisaran.datetime(*expected)) == seconds
+
+
+def test_from_seconds_before_time():
+    with pytest.raises(telisaran.InvalidDateError):
+        telisaran.datetime.from_seconds(-1)
+    with pytest.raises(telisaran.InvalidDateError):
+        telisaran.datetime.from_seconds(0) - 1
+
+
+def test_from_seconds_many():
+    numpy = pytest.importorskip('numpy')
+    limit = FIRST_ERA + SECOND_ERA + 20000 * ONE_YEAR_IN_SECONDS
+    seconds = [int(dt) for dt in fixtures + festival_fixtures]
+    seconds += [0, FIRST_ERA - 1, FIRST_ERA, FIRST_ERA + SECOND_ERA - 1, FIRST_ERA + SECOND_ERA]
+    seconds += [random.randrange(limit) for i in range(1000)]
+
+    columns = telisaran.from_seconds_many(numpy.array(seconds))
+    for (i, value) in enumerate(seconds):
+        parts = tuple(int(column[i]) for column in columns)
+        assert parts == telisaran.datetime.from_seconds(value).parts
+        assert int(telisaran.datetime(*parts)) == value
+
+    assert [list(column) for column in telisaran.from_seconds_many(array('q', seconds[:10]))] == \
+        [list(column[:10]) for column in columns]
+    with pytest.raises(telisaran.InvalidDateError):
+        telisaran.from_seconds_many([0, -1])
+
+
+def test_parser_units():
+    assert telisaran.parser().get_unit_class('days') is telisaran.Day
+    assert telisaran.parser().get_unit_class('Span') is telisaran.Span
+    with pytest.raises(telisaran.ParseError):
+        telisaran.parser().get_unit_class('fortnights')
+
+
+def test_parser_cache():
+    telisaran.parser.clear_cache()
+    expected = int(telisaran.today) - 2 * ONE_DAY_IN_SECONDS
+    assert telisaran.datetime.from_expression('2 days ago') == expected
+    assert telisaran.datetime.from_expression('2 days ago') == expected
+    assert telisaran.parser.cache_info() == {'hits': 1, 'misses': 1, 'size': 1}
+
+    # a different 'now' is a different key
+    assert telisaran.datetime.from_expression('2 days ago', now=3 * ONE_DAY_IN_SECONDS) == ONE_DAY_IN_SECONDS
+    assert telisaran.parser.cache_info()['misses'] == 2
+
+    # an unversioned timeline bypasses the cache; a versioned one is keyed by version
+    timeline = {'Start': telisaran.datetime.from_seconds(ONE_DAY_IN_SECONDS)}
+    assert telisaran.datetime.from_expression('1 day after start', timeline=timeline) == 2 * ONE_DAY_IN_SECONDS
+    assert telisaran.parser.cache_info()['size'] == 2
+    assert telisaran.datetime.from_expression(
+        '1 day after start', timeline=timeline, version=1) == 2 * ONE_DAY_IN_SECONDS
+    timeline['Start'] = telisaran.datetime.from_seconds(0)
+    assert telisaran.datetime.from_expression('1 day after start', timeline=timeline, version=2) == ONE_DAY_IN_SECONDS
+    assert telisaran.parser.cache_info() == {'hits': 1, 'misses': 4, 'size': 4}
+
+    telisaran.parser.cache_size = 2
+    try:
+        telisaran.datetime.from_expression('on 1.1.1.1')
+        assert telisaran.parser.cache_info()['size'] == 2
+    finally:
+        telisaran.parser.cache_size = 1024
+        telisaran.parser.clear_cache()
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ('2 days and 3 hours after 1.1.1.10', 11 * ONE_DAY_IN_SECONDS + 3 * 3600),
+    ('1 day, 2 hours and 3 minutes after 1.1.1.10', 10 * ONE_DAY_IN_SECONDS + 2 * 3600 + 180),
+    ('1 season earlier than 1.1.2.1', 0),
+    ('3 days after 2 spans before 1.1.3.1', ONE_SEASON_IN_SECONDS * 2 - 7 * ONE_DAY_IN_SECONDS),
+    ('at 2 days after 1.1.1.1', 2 * ONE_DAY_IN_SECONDS),
+    ('1 day after start', 2 * ONE_DAY_IN_SECONDS),
+    ('2 days before the party returns from the feywild', 8 * ONE_DAY_IN_SECONDS),
+])
+def test_parser_grammar(expression, expected):
+    timeline = {
+        'Start': telisaran.datetime.from_seconds(ONE_DAY_IN_SECONDS),
+        'The Party Returns From The Feywild': telisaran.datetime.from_seconds(10 * ONE_DAY_IN_SECONDS),
+    }
+    assert int(telisaran.parser(timeline=timeline).parse(expression)) == expected
+
+
+def test_parser_range():
+    (start, end) = telisaran.parser().parse_range('between 2 days and 3 hours after 1.1.1.1 and 1.1.1.10')
+    assert int(start) == 2 * ONE_DAY_IN_SECONDS + 3 * 3600
+    assert int(end) == 9 * ONE_DAY_IN_SECONDS
+    with pytest.raises(telisaran.ParseError):
+        telisaran.parser().parse_range('between 1.1.1.1')
+    with pytest.raises(telisaran.ParseError):
+        telisaran.parser().parse_range('1.1.1.1')
+    with pytest.raises(telisaran.ParseError):
+        telisaran.parser().parse('between 1.1.1.1 and 1.1.1.5')
+    with pytest.raises(telisaran.ParseError):
+        telisaran.datetime.from_expression('between 1.1.1.1 and 1.1.1.5')
+
+
+@pytest.mark.parametrize('expression', ['on 1.2.3.4.5.6.7.8', 'between 1.1.1.1 and 1.2.3.4.5.6.7.8', 'on 1.1.1.99'])
+def test_parser_invalid_dates(expression):
+    with pytest.raises(telisaran.ReckoningError):
+        telisaran.parser().parse_range(expression) if 'between' in expression else telisaran.parser().parse(expression)
+
+
+def test_parser_parse_many():
+    script = {
+        'Campaign start': 'on 1.1.1.2',
+        'Party returns': '2 days after party sets out',
+        'Party sets out': '3 days after campaign start',
+        'The journey': 'between party sets out and party returns',
+    }
+    dates = telisaran.parser().parse_many(script)
+    assert int(dates['Party sets out']) == 4 * ONE_DAY_IN_SECONDS
+    assert int(dates['Party returns']) == 6 * ONE_DAY_IN_SECONDS
+    assert tuple(map(int, dates['The journey'])) == (4 * ONE_DAY_IN_SECONDS, 6 * ONE_DAY_IN_SECONDS)
+
+    with pytest.raises(telisaran.ParseError):
+        telisaran.parser().parse_many({'A': '1 day after b', 'B': '1 day after a'})
+    with pytest.raises(telisaran.ParseError):
+        telisaran.parser().parse_many({'A': 'between 1.1.1.1 and 1.1.1.2', 'B': '1 day after a'})
+
+
+def test_daterange():
+    start = telisaran.datetime(era=3, year=1, season=1, day=1)
+    end = telisaran.datetime(era=3, year=1, season=2, day=1)
+    days = list(telisaran.daterange(start, end))
+    assert len(days) == 45
+    assert days[0] == int(start)
+    assert days[-1] == int(end) - ONE_DAY_IN_SECONDS
+    assert list(telisaran.daterange(0, ONE_YEAR_IN_SECONDS, telisaran.Season))[-1] == 8 * ONE_SEASON_IN_SECONDS
+
+
+@pytest.mark.parametrize('rule, count, check', [
+    ('every Freydag', 8 * 9, lambda dt: dt.day.name == 'Freydag'),
+    ('every day', 365, lambda dt: True),
+    ('first day of each season', 8, lambda dt: dt.day.day_of_season == 1 and dt.season.number < 9),
+    ('last day of each span', 73, lambda dt: dt.day.day_of_span == 5),
+    ('every Festival of the Hunt', 1, lambda dt: dt.season.number == 9 and dt.day.day_of_season == 1),
+    ("every Freya's Hunt", 1, lambda dt: dt.day.name == "Freya's Hunt"),
+    ('23rd day of every season', 8, lambda dt: dt.day.day_of_season == 23),
+    ('the 100th day of the year', 1, lambda dt: dt.season.number == 3 and dt.day.day_of_season == 10),
+])
+def test_recurrence(rule, count, check):
+    start = telisaran.datetime(era=2, year=10000, season=1, day=1)
+    dates = list(telisaran.recurrence(rule, start, int(start) + 2 * ONE_YEAR_IN_SECONDS))
+    assert len(dates) == 2 * count
+    assert dates == sorted(dates)
+    for seconds in dates:
+        assert check(telisaran.datetime.from_seconds(seconds))
+
+
+def test_recurrence_start():
+    start = int(telisaran.datetime(era=3, year=5, season=9, day=3))
+    dates = telisaran.recurrence('every Festival of the Hunt', start)
+    assert next(dates) == int(telisaran.datetime(era=3, year=6, season=9, day=1))
+    assert next(dates) == int(telisaran.datetime(era=3, year=7, season=9, day=1))
+    with pytest.raises(telisaran.ParseError):
+        next(telisaran.recurrence('46th day of each season', start))
+    with pytest.raises(telisaran.ParseError):
+        next(telisaran.recurrence('whenever', start))